@@ -2,8 +2,9 @@
 """migrate-vault-tasks — one-time import of existing vault tasks into lobwife DB.
 
 Parses all task files in 010-tasks/{active,completed,failed}/, extracts
-frontmatter metadata, and POSTs to the lobwife API. Outputs a mapping
-of old slugs to new DB IDs.
+frontmatter metadata, and POSTs them to the lobwife batch API
+(/api/v1/tasks:batch) in chunks. Outputs a mapping of old slugs to new
+DB IDs.
 
 Usage:
     # Against dev
@@ -28,6 +29,7 @@ import yaml
 
 LOBWIFE_URL = os.environ.get("LOBWIFE_URL", "http://localhost:8081")
 FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+BATCH_SIZE = 500
 
 
 def parse_frontmatter(content: str) -> dict:
@@ -69,18 +71,27 @@ async def main():
     async with aiohttp.ClientSession() as session:
         existing_slugs = set()
         try:
-            async with session.get(
-                f"{LOBWIFE_URL}/api/v1/tasks",
-                params={"limit": "500"},
-                timeout=aiohttp.ClientTimeout(total=15),
-            ) as resp:
-                if resp.status == 200:
+            # Page through all tasks (keyset on id) fetching only the
+            # columns needed for the duplicate check
+            after_id = 0
+            while True:
+                async with session.get(
+                    f"{LOBWIFE_URL}/api/v1/tasks",
+                    params={"limit": "500", "after_id": str(after_id), "fields": "slug,name"},
+                    timeout=aiohttp.ClientTimeout(total=15),
+                ) as resp:
+                    if resp.status != 200:
+                        break
                     tasks = await resp.json()
-                    for t in tasks:
-                        if t.get("slug"):
-                            existing_slugs.add(t["slug"])
-                        if t.get("name"):
-                            existing_slugs.add(t["name"])
+                    cursor = resp.headers.get("X-Next-Cursor")
+                for t in tasks:
+                    if t.get("slug"):
+                        existing_slugs.add(t["slug"])
+                    if t.get("name"):
+                        existing_slugs.add(t["name"])
+                if not cursor:
+                    break
+                after_id = int(cursor)
         except Exception as e:
             print(f"Warning: failed to check existing tasks: {e}")
 
@@ -88,6 +99,7 @@ async def main():
         skipped = 0
         created = 0
         errors = 0
+        pending = []  # (slug, payload)
 
         for task_file in task_files:
             slug = task_file.stem
@@ -132,50 +144,44 @@ async def main():
             # Clean None values
             payload = {k: v for k, v in payload.items() if v is not None}
 
+            # Events logged in the same transaction as the insert
+            events = [{"event_type": "migrated", "detail": f"Migrated from vault: {slug}"}]
+            status = meta.get("status", "queued")
+            if status != "queued":
+                events.append({"event_type": status, "detail": f"Status at migration time: {status}"})
+            payload["events"] = events
+
+            pending.append((slug, payload))
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[start:start + BATCH_SIZE]
             try:
                 async with session.post(
-                    f"{LOBWIFE_URL}/api/v1/tasks",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=15),
+                    f"{LOBWIFE_URL}/api/v1/tasks:batch",
+                    json={"tasks": [payload for _, payload in chunk]},
+                    timeout=aiohttp.ClientTimeout(total=60),
                 ) as resp:
                     body = await resp.json()
-                    if resp.status == 201:
-                        db_id = body["id"]
-                        task_id = body["task_id"]
-                        mapping[slug] = {"db_id": db_id, "task_id": task_id}
-                        print(f"  OK: {slug} -> {task_id} (id={db_id})")
-                        created += 1
-
-                        # Log creation event
-                        await session.post(
-                            f"{LOBWIFE_URL}/api/v1/tasks/{db_id}/events",
-                            json={
-                                "event_type": "migrated",
-                                "detail": f"Migrated from vault: {slug}",
-                                "actor": "migration",
-                            },
-                            timeout=aiohttp.ClientTimeout(total=5),
-                        )
-
-                        # If task has a non-queued status, log that too
-                        status = meta.get("status", "queued")
-                        if status != "queued":
-                            await session.post(
-                                f"{LOBWIFE_URL}/api/v1/tasks/{db_id}/events",
-                                json={
-                                    "event_type": status,
-                                    "detail": f"Status at migration time: {status}",
-                                    "actor": "migration",
-                                },
-                                timeout=aiohttp.ClientTimeout(total=5),
-                            )
-                    else:
+                    if resp.status != 200:
                         error_msg = body.get("error", str(body))
-                        print(f"  ERROR: {slug} — {resp.status}: {error_msg}")
-                        errors += 1
+                        print(f"  ERROR: batch of {len(chunk)} — {resp.status}: {error_msg}")
+                        errors += len(chunk)
+                        continue
             except Exception as e:
-                print(f"  ERROR: {slug} — {e}")
-                errors += 1
+                print(f"  ERROR: batch of {len(chunk)} — {e}")
+                errors += len(chunk)
+                continue
+
+            for (slug, _), result in zip(chunk, body["results"]):
+                if result["status"] == 201:
+                    db_id = result["id"]
+                    task_id = result["task_id"]
+                    mapping[slug] = {"db_id": db_id, "task_id": task_id}
+                    print(f"  OK: {slug} -> {task_id} (id={db_id})")
+                    created += 1
+                else:
+                    print(f"  ERROR: {slug} — {result['status']}: {result.get('error')}")
+                    errors += 1
 
     print(f"\nDone: {created} created, {skipped} skipped, {errors} errors")
 
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """lobmob-status-reporter — periodic fleet summary.
 
-Python rewrite of lobmob-status-reporter.sh. Task counts come from
-lobwife API instead of vault grep. Worker counts from kubectl.
+Python rewrite of lobmob-status-reporter.sh. Task counts come from the
+lobwife /api/v1/tasks/stats endpoint instead of vault grep. Worker counts from kubectl.
 """
 
 import asyncio
@@ -65,26 +65,24 @@ async def main():
     tasks_active = 0
     tasks_completed = 0
     tasks_failed = 0
+    queue_age = ""
 
     try:
         async with aiohttp.ClientSession() as session:
-            url = f"{LOBWIFE_URL}/api/v1/tasks"
-            for status in ("queued", "active", "completed", "failed"):
-                async with session.get(
-                    url, params={"status": status, "limit": "500"},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        count = len(data)
-                        if status == "queued":
-                            tasks_queued = count
-                        elif status == "active":
-                            tasks_active = count
-                        elif status == "completed":
-                            tasks_completed = count
-                        elif status == "failed":
-                            tasks_failed = count
+            async with session.get(
+                f"{LOBWIFE_URL}/api/v1/tasks/stats",
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                resp.raise_for_status()
+                stats = await resp.json()
+        by_status = stats.get("by_status", {})
+        tasks_queued = by_status.get("queued", 0)
+        tasks_active = by_status.get("active", 0)
+        tasks_completed = by_status.get("completed", 0)
+        tasks_failed = by_status.get("failed", 0)
+        age = stats.get("queue_age_seconds") or {}
+        if age.get("count"):
+            queue_age = f" (queue age p50 {age['p50'] / 60:.0f}m, max {age['max'] / 60:.0f}m)"
     except Exception as e:
         log.warning("Failed to get task counts from API, falling back to vault: %s", e)
         # Fallback to vault grep
@@ -127,7 +125,7 @@ async def main():
         f"**[status-report]** Fleet Summary — {now_utc} UTC\n"
         f"**Lobsters:** {total_pods} total ({active_pods} running, {pending_pods} pending)\n"
         f"**Types:** research={type_research}, swe={type_swe}, qa={type_qa}\n"
-        f"**Tasks:** {tasks_queued} queued, {tasks_active} active, {tasks_completed} completed, {tasks_failed} failed\n"
+        f"**Tasks:** {tasks_queued} queued, {tasks_active} active, {tasks_completed} completed, {tasks_failed} failed{queue_age}\n"
         f"**PRs:** {vault_prs} open\n"
         f"**Cost:** ~${hourly_cost:.2f}/hr (${monthly_cost}/mo est.)"
     )
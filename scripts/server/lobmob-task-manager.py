@@ -89,6 +89,12 @@ async def _api_update_task(session, db_id: int, **fields):
     return await _api_request(session, "PATCH", f"/api/v1/tasks/{db_id}", json=fields)
 
 
+async def _api_update_tasks(session, updates: list[dict]) -> list:
+    """Batch PATCH; returns per-item results in order."""
+    body = await _api_request(session, "PATCH", "/api/v1/tasks:batch", json={"tasks": updates})
+    return body["results"]
+
+
 async def _api_log_event(session, db_id: int, event_type: str, detail: str):
     try:
         await _api_request(
@@ -268,17 +274,25 @@ async def detect_orphans(session: aiohttp.ClientSession):
     k8s_jobs = _get_k8s_jobs()
     os.makedirs(TASK_STATE_DIR, exist_ok=True)
 
+    # Re-queues and failures are applied in one batch PATCH after the scan
+    requeue = []   # (task, elapsed_min)
+    failures = []  # (task, elapsed_min)
+
     for task in tasks:
         db_id = task["id"]
         task_id = task["task_id"]
         assigned_to = task.get("assigned_to", "")
         thread_id = task.get("discord_thread_id", "")
         assigned_at = task.get("assigned_at", "")
-        task_type = task.get("type", "unknown")
 
         if not assigned_to:
             continue
 
+        # Claimed by the poller but not yet confirmed (no Job spawned): a
+        # live lease is in progress, an expired one is reclaimed by the poller
+        if task.get("lease_expires_at"):
+            continue
+
         # Check if the assigned job exists (any state)
         if assigned_to in k8s_jobs:
             continue
@@ -305,33 +319,53 @@ async def detect_orphans(session: aiohttp.ClientSession):
             # Re-queue
             _log_file(f"ORPHAN RE-QUEUE: {task_id} — {assigned_to} gone after {elapsed_min}m")
             _broker_deregister(task_id)
-            try:
-                await _api_update_task(session, db_id,
-                    status="queued", assigned_to=None, assigned_at=None,
-                    broker_repos=None, broker_status=None,
-                    actor="task-manager")
-                await _api_log_event(session, db_id, "requeued", f"{assigned_to} offline after {elapsed_min}m")
-            except Exception as e:
-                log.error("Failed to re-queue %s via API: %s", task_id, e)
-
-            _discord_post(thread_id,
-                f"**[task-manager]** Re-queued **{task_id}** — **{assigned_to}** went offline. Will reassign.")
+            requeue.append((task, elapsed_min))
         else:
             # Mark failed
             _log_file(f"ORPHAN FAILED: {task_id} — {assigned_to} gone after {elapsed_min}m, no PR")
             _broker_deregister(task_id)
-            try:
-                await _api_update_task(session, db_id, status="failed", actor="task-manager")
-                await _api_log_event(session, db_id, "failed", f"Orphan: {assigned_to} offline {elapsed_min}m, no PR")
-            except Exception as e:
-                log.error("Failed to fail %s via API: %s", task_id, e)
+            failures.append((task, elapsed_min))
 
-            _discord_post(thread_id,
-                f"**[task-manager]** Failed **{task_id}** — **{assigned_to}** offline for {elapsed_min}m with no PR.")
+    if not requeue and not failures:
+        return
+
+    updates = [
+        {"id": task["id"], "status": "queued", "assigned_to": None, "assigned_at": None,
+         "broker_repos": None, "broker_status": None, "lease_expires_at": None,
+         "actor": "task-manager"}
+        for task, _ in requeue
+    ] + [
+        {"id": task["id"], "status": "failed", "actor": "task-manager"}
+        for task, _ in failures
+    ]
+    try:
+        results = await _api_update_tasks(session, updates)
+    except Exception as e:
+        log.error("Failed to apply orphan updates via API: %s", e)
+        return
+    applied = [r["status"] == 200 for r in results]
+
+    for (task, elapsed_min), ok in zip(requeue, applied):
+        task_id, assigned_to = task["task_id"], task.get("assigned_to", "")
+        if not ok:
+            log.error("Failed to re-queue %s via API", task_id)
+            continue
+        await _api_log_event(session, task["id"], "requeued", f"{assigned_to} offline after {elapsed_min}m")
+        _discord_post(task.get("discord_thread_id", ""),
+            f"**[task-manager]** Re-queued **{task_id}** — **{assigned_to}** went offline. Will reassign.")
+
+    for (task, elapsed_min), ok in zip(failures, applied[len(requeue):]):
+        task_id, assigned_to = task["task_id"], task.get("assigned_to", "")
+        if not ok:
+            log.error("Failed to fail %s via API", task_id)
+            continue
+        await _api_log_event(session, task["id"], "failed", f"Orphan: {assigned_to} offline {elapsed_min}m, no PR")
+        _discord_post(task.get("discord_thread_id", ""),
+            f"**[task-manager]** Failed **{task_id}** — **{assigned_to}** offline for {elapsed_min}m with no PR.")
 
-            # Layer 3: Create investigation task
-            await _create_investigation_task(session, task_id, task_type, assigned_to,
-                f"Orphan: lobster offline {elapsed_min}m, no PR, no fallback branch")
+        # Layer 3: Create investigation task
+        await _create_investigation_task(session, task_id, task.get("type", "unknown"), assigned_to,
+            f"Orphan: lobster offline {elapsed_min}m, no PR, no fallback branch")
 
 
 async def _create_investigation_task(
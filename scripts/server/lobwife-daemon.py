@@ -4,7 +4,7 @@
 Slim orchestrator that initializes the SQLite database, starts the job
 scheduler and token broker, serves the HTTP API, and handles shutdown.
 All business logic lives in extracted modules:
-  - lobwife_db.py     — DB init, migration, connection
+  - lobwife_db.py     — DB init, migration, read pool + writer
   - lobwife_jobs.py   — JobRunner (cron scheduling)
   - lobwife_broker.py — TokenBroker (GitHub credential broker)
   - lobwife_api.py    — HTTP routes (existing + Task CRUD)
@@ -23,7 +23,7 @@ from aiohttp import web
 # Ensure sibling modules are importable (scripts/server/)
 sys.path.insert(0, str(Path(__file__).parent))
 
-from lobwife_db import init_db, close_db, get_db, DB_PATH, STATE_DIR
+from lobwife_db import init_db, close_db, run_write, DB_PATH, STATE_DIR
 from lobwife_jobs import JobRunner, JOB_DEFS
 from lobwife_broker import TokenBroker
 from lobwife_api import build_app
@@ -78,11 +78,14 @@ async def main():
         while True:
             await asyncio.sleep(300)
             try:
-                db = await get_db()
-                # WAL checkpoint
-                await db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                # WAL checkpoint (outside a transaction, between write batches)
+                await run_write(
+                    lambda db: db.execute("PRAGMA wal_checkpoint(PASSIVE)"),
+                    transaction=False,
+                )
                 # Broker cleanup
                 await broker.cleanup_expired()
+                await broker.compact_audit()
                 # Hourly backup (every 12 iterations of 5-min loop)
                 backup_counter += 1
                 if backup_counter >= 12:
@@ -116,6 +119,7 @@ async def main():
     sync_daemon.stop()
     runner.scheduler.shutdown(wait=False)
     await api_runner.cleanup()
+    await broker.close()
     await close_db()
     log.info("Shutdown complete")
 
@@ -30,11 +30,67 @@ CREATE TABLE IF NOT EXISTS tasks (
     broker_repos        TEXT,
     broker_status       TEXT,
     token_count         INTEGER NOT NULL DEFAULT 0,
-    broker_registered_at TEXT
+    broker_registered_at TEXT,
+    lease_expires_at    TEXT,           -- claim lease (POST /api/v1/tasks/claim)
+    -- Scheduling order (lower first); indexed with status + queued_at
+    priority_rank       INTEGER GENERATED ALWAYS AS (
+        CASE priority WHEN 'critical' THEN 0 WHEN 'high' THEN 1 WHEN 'low' THEN 3 ELSE 2 END
+    ) VIRTUAL
 );
 
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_tasks_type   ON tasks(type);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks(updated_at);
+
+-- Task counts by status/type/priority, maintained by triggers so stats
+-- reads are O(1) regardless of table size (backfilled by migration v3)
+CREATE TABLE IF NOT EXISTS task_counts (
+    dimension   TEXT    NOT NULL,   -- status | type | priority
+    value       TEXT    NOT NULL,
+    count       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, value)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_task_counts_insert AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO task_counts (dimension, value, count) VALUES ('status', NEW.status, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+    INSERT INTO task_counts (dimension, value, count) VALUES ('type', NEW.type, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+    INSERT INTO task_counts (dimension, value, count) VALUES ('priority', NEW.priority, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_task_counts_delete AFTER DELETE ON tasks
+BEGIN
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'status' AND value = OLD.status;
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'type' AND value = OLD.type;
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'priority' AND value = OLD.priority;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_task_counts_status AFTER UPDATE OF status ON tasks
+WHEN OLD.status IS NOT NEW.status
+BEGIN
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'status' AND value = OLD.status;
+    INSERT INTO task_counts (dimension, value, count) VALUES ('status', NEW.status, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_task_counts_type AFTER UPDATE OF type ON tasks
+WHEN OLD.type IS NOT NEW.type
+BEGIN
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'type' AND value = OLD.type;
+    INSERT INTO task_counts (dimension, value, count) VALUES ('type', NEW.type, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_task_counts_priority AFTER UPDATE OF priority ON tasks
+WHEN OLD.priority IS NOT NEW.priority
+BEGIN
+    UPDATE task_counts SET count = count - 1 WHERE dimension = 'priority' AND value = OLD.priority;
+    INSERT INTO task_counts (dimension, value, count) VALUES ('priority', NEW.priority, 1)
+        ON CONFLICT(dimension, value) DO UPDATE SET count = count + 1;
+END;
 
 -- Task event log (audit trail)
 CREATE TABLE IF NOT EXISTS task_events (
@@ -48,6 +104,14 @@ CREATE TABLE IF NOT EXISTS task_events (
 
 CREATE INDEX IF NOT EXISTS idx_task_events_task_id ON task_events(task_id);
 
+-- Persisted cursors for background consumers of task_events
+-- (vault sync: last task_events.id reflected in the vault)
+CREATE TABLE IF NOT EXISTS sync_state (
+    name        TEXT PRIMARY KEY,
+    cursor      INTEGER NOT NULL,
+    updated_at  TEXT    NOT NULL DEFAULT (datetime('now'))
+);
+
 -- Cron job state (replaces jobs.json)
 CREATE TABLE IF NOT EXISTS job_state (
     name            TEXT PRIMARY KEY,
@@ -5,51 +5,323 @@ plus new /api/v1/tasks CRUD endpoints and DB-enriched /health.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import math
 import os
 import time
+from collections import Counter
+from datetime import datetime, timezone
 
 from aiohttp import web
 
-from lobwife_db import get_db, DB_PATH
+from lobwife_db import (
+    read_db, run_write, log_event, flush_events, db_stats, task_counts,
+    changes_head, read_changes, DB_PATH,
+)
 from lobwife_jobs import JobRunner
 from lobwife_broker import TokenBroker
 from lobwife_sync import VaultSyncDaemon
 
 log = logging.getLogger("lobwife")
 
+# Task references the broker resolves tokens by (besides the T-id); writes
+# to them invalidate its alias cache
+BROKER_ALIAS_FIELDS = {"slug", "name", "assigned_to"}
+
 # Whitelisted fields for PATCH /api/v1/tasks/{id}
 TASK_PATCH_FIELDS = {
     "name", "type", "status", "priority", "model", "assigned_to",
     "repos", "discord_thread_id", "estimate_minutes", "requires_qa",
     "workflow", "assigned_at", "completed_at",
     "broker_repos", "broker_status", "token_count", "broker_registered_at",
+    "lease_expires_at",
 }
 
 VALID_TASK_STATUSES = {
     "queued", "active", "completed", "failed", "cancelled", "blocked",
 }
 
+# Max items per POST/PATCH /api/v1/tasks:batch request
+BATCH_MAX_ITEMS = 1000
+
+# Change feed: max long-poll wait and SSE keepalive interval (seconds)
+CHANGES_MAX_WAIT = float(os.environ.get("LOBWIFE_CHANGES_MAX_WAIT", "60"))
+CHANGES_KEEPALIVE = 15.0
+CHANGES_MAX = 500  # max ?limit= events per response
+
+# Columns returned by GET /api/v1/tasks (and selectable via ?fields=)
+TASK_LIST_FIELDS = (
+    "id", "name", "slug", "type", "status", "priority", "model",
+    "assigned_to", "repos", "discord_thread_id", "estimate_minutes",
+    "requires_qa", "workflow", "created_at", "updated_at", "queued_at",
+    "assigned_at", "completed_at", "lease_expires_at",
+)
+TASK_LIST_MAX = 500  # max ?limit= for GET /api/v1/tasks
+
+# Scheduler (GET /api/v1/tasks/next, POST /api/v1/tasks/claim) limits
+SCHEDULE_MAX_TASKS = 100
+SCHEDULE_SCAN_MAX = 5000  # rows examined per selection when quotas skip tasks
+CLAIM_LEASE_DEFAULT = 300
+CLAIM_LEASE_MAX = 3600
+
+# Longest GET /api/token/wait may block for a registration (seconds)
+TOKEN_WAIT_MAX = 120
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return round(sorted_values[rank], 1)
+
+
+def _task_repos(raw) -> list[str]:
+    """Repos of a task row (stored as a JSON list)."""
+    if not raw:
+        return []
+    repos = json.loads(raw) if isinstance(raw, str) else raw
+    return repos if isinstance(repos, list) else []
+
+
+def _format_task(task: dict) -> dict:
+    """Add task_id and decode JSON/bool columns of a tasks row dict."""
+    task["task_id"] = f"T{task['id']}"
+    task["requires_qa"] = bool(task["requires_qa"])
+    if task["repos"]:
+        task["repos"] = json.loads(task["repos"])
+    return task
+
+
+def _parse_schedule_params(limit, types, per_type, per_repo) -> tuple[tuple | None, str | None]:
+    """Validate scheduler params. Returns ((limit, types, per_type, per_repo), error)."""
+    try:
+        limit = int(limit)
+        per_type = int(per_type or 0)
+        per_repo = int(per_repo or 0)
+    except (TypeError, ValueError):
+        return None, "limit/per_type/per_repo must be integers"
+    if not 1 <= limit <= SCHEDULE_MAX_TASKS:
+        return None, f"limit must be 1..{SCHEDULE_MAX_TASKS}"
+    if per_type < 0 or per_repo < 0:
+        return None, "per_type/per_repo must be >= 0"
+    if types is not None and (not isinstance(types, list)
+                              or not all(isinstance(t, str) for t in types)):
+        return None, "types must be a list of strings"
+    return (limit, types or None, per_type, per_repo), None
+
+
+async def _select_runnable(db, limit: int, types: list[str] | None = None,
+                           per_type: int = 0, per_repo: int = 0) -> list[dict]:
+    """Top-limit runnable tasks in dispatch order (priority_rank, queued_at, id).
+
+    Runnable means active with an expired claim lease (offered first, as
+    "reclaimed"), then queued and not held back by a future
+    lease_expires_at (a released claim's retry backoff); system tasks never. per_type / per_repo cap
+    how many tasks of one type / touching one repo may be active at once,
+    counting tasks already active plus those selected here (0 = no cap).
+    Rows are read in idx_tasks_schedule order, so the cost is the rows
+    scanned (at most SCHEDULE_SCAN_MAX), not the queue depth.
+    """
+    type_sql = ""
+    if types:
+        type_sql = f" AND type IN ({', '.join('?' * len(types))})"
+    columns = ", ".join(TASK_LIST_FIELDS)
+    quotas = bool(per_type or per_repo)
+
+    active_types: Counter = Counter()
+    active_repos: Counter = Counter()
+    if quotas:
+        async with db.execute(
+            """SELECT type, repos FROM tasks WHERE status = 'active'
+               AND (lease_expires_at IS NULL OR lease_expires_at >= datetime('now'))"""
+        ) as cur:
+            for r in await cur.fetchall():
+                active_types[r["type"]] += 1
+                active_repos.update(_task_repos(r["repos"]))
+
+    def admit(task: dict) -> bool:
+        repos = _task_repos(task["repos"])
+        if per_type and active_types[task["type"]] >= per_type:
+            return False
+        if per_repo and any(active_repos[r] >= per_repo for r in repos):
+            return False
+        active_types[task["type"]] += 1
+        active_repos.update(repos)
+        return True
+
+    selected: list[dict] = []
+    scanned = 0
+    for status_sql, reclaimed in (
+        ("status = 'active' AND lease_expires_at < datetime('now')", True),
+        ("status = 'queued' AND (lease_expires_at IS NULL OR lease_expires_at < datetime('now'))", False),
+    ):
+        sql = f"""SELECT {columns} FROM tasks
+                  WHERE {status_sql} AND type != 'system'{type_sql}
+                  ORDER BY priority_rank, queued_at, id"""
+        params: list = list(types or [])
+        sql += " LIMIT ?"
+        params.append(limit - len(selected) if not quotas else SCHEDULE_SCAN_MAX - scanned)
+        async with db.execute(sql, params) as cur:
+            async for row in cur:
+                scanned += 1
+                task = dict(row)
+                if admit(task):
+                    task["reclaimed"] = reclaimed
+                    selected.append(task)
+                    if len(selected) >= limit:
+                        break
+        if len(selected) >= limit or scanned >= SCHEDULE_SCAN_MAX:
+            break
+    return selected
+
+
+async def _claim_tasks(db, claimant: str, lease_seconds: int, limit: int,
+                       types: list[str] | None, per_type: int, per_repo: int) -> list[dict]:
+    """Assign the next runnable tasks to claimant under a lease.
+
+    Runs inside one write job, so concurrent claims never return the same
+    task. Returns the claimed rows in dispatch order.
+    """
+    candidates = await _select_runnable(db, limit, types, per_type, per_repo)
+    if not candidates:
+        return []
+
+    placeholders = ", ".join("?" * len(candidates))
+    async with db.execute(
+        f"""UPDATE tasks SET status = 'active', assigned_to = ?,
+                assigned_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now'),
+                lease_expires_at = datetime('now', ?),
+                updated_at = datetime('now')
+            WHERE id IN ({placeholders})
+            RETURNING {', '.join(TASK_LIST_FIELDS)}""",
+        (claimant, f"+{lease_seconds} seconds", *(t["id"] for t in candidates)),
+    ) as cur:
+        updated = {r["id"]: dict(r) for r in await cur.fetchall()}
+
+    await db.executemany(
+        "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+        [
+            (t["id"], "claimed",
+             f"Claimed by {claimant} (lease {lease_seconds}s"
+             f"{', reclaimed expired lease' if t['reclaimed'] else ''})",
+             claimant)
+            for t in candidates
+        ],
+    )
+
+    return [
+        {**_format_task(updated[t["id"]]), "reclaimed": t["reclaimed"]}
+        for t in candidates
+    ]
+
+
+def _parse_new_task(data: dict) -> tuple[tuple | None, str | None]:
+    """Validate a create payload. Returns (INSERT params, error)."""
+    name = (data.get("name") or "").strip()
+    if not name:
+        return None, "name is required"
+
+    status = data.get("status", "queued")
+    if status not in VALID_TASK_STATUSES:
+        return None, f"invalid status: {status}"
+
+    repos = data.get("repos")
+    return (
+        name,
+        data.get("slug"),
+        data.get("type", "swe"),
+        status,
+        data.get("priority", "normal"),
+        data.get("model"),
+        data.get("assigned_to"),
+        json.dumps(repos) if repos else None,
+        data.get("discord_thread_id"),
+        data.get("estimate_minutes"),
+        1 if data.get("requires_qa") else 0,
+        data.get("workflow"),
+    ), None
+
+
+async def _insert_task(db, params: tuple, actor: str | None) -> int:
+    """INSERT a validated task plus its 'created' event. Returns the new id."""
+    async with db.execute(
+        """INSERT INTO tasks (name, slug, type, status, priority, model,
+           assigned_to, repos, discord_thread_id, estimate_minutes,
+           requires_qa, workflow)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        params,
+    ) as cur:
+        task_id = cur.lastrowid
+
+    # Log creation event
+    await db.execute(
+        "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+        (task_id, "created", f"Task created with status={params[3]}", actor),
+    )
+    return task_id
+
+
+def _parse_task_update(data: dict) -> tuple[tuple | None, str | None]:
+    """Validate a PATCH payload. Returns ((SET clause, values, changed), error)."""
+    # Filter to whitelisted fields
+    updates = {}
+    for key, val in data.items():
+        if key in TASK_PATCH_FIELDS:
+            if key in ("repos", "broker_repos") and isinstance(val, list):
+                updates[key] = json.dumps(val)
+            elif key == "requires_qa":
+                updates[key] = 1 if val else 0
+            elif key == "status" and val not in VALID_TASK_STATUSES:
+                return None, f"invalid status: {val}"
+            else:
+                updates[key] = val
+
+    if not updates:
+        return None, "no valid fields to update"
+
+    sets = [f"{k} = ?" for k in updates] + ["updated_at = datetime('now')"]
+    return (", ".join(sets), list(updates.values()), list(updates)), None
+
+
+async def _apply_task_update(db, task_id: int, update: tuple, actor: str | None) -> bool:
+    """UPDATE a task plus its 'updated' event. Returns False if not found."""
+    set_clause, vals, changed = update
+    async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
+        if not await cur.fetchone():
+            return False
+    await db.execute(f"UPDATE tasks SET {set_clause} WHERE id = ?", (*vals, task_id))
+
+    # Log update event
+    await db.execute(
+        "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+        (task_id, "updated", f"Updated: {', '.join(changed)}", actor),
+    )
+    return True
+
 
 def build_app(runner: JobRunner, broker: TokenBroker,
               sync_daemon: VaultSyncDaemon | None = None) -> web.Application:
     app = web.Application()
+    change_streams: set[asyncio.Task] = set()
 
     # === Health & status ===
 
     async def handle_health(request):
         db_status = {"ok": False}
         try:
-            db = await get_db()
-            async with db.execute("SELECT 1 FROM schema_version") as cur:
-                await cur.fetchone()
+            async with read_db() as db:
+                async with db.execute("SELECT 1 FROM schema_version") as cur:
+                    await cur.fetchone()
+                async with db.execute("SELECT COUNT(*) as cnt FROM tasks") as cur:
+                    task_count = (await cur.fetchone())["cnt"]
             db_size = DB_PATH.stat().st_size if DB_PATH.exists() else 0
-            async with db.execute("SELECT COUNT(*) as cnt FROM tasks") as cur:
-                task_count = (await cur.fetchone())["cnt"]
             db_status = {"ok": True, "size_bytes": db_size, "task_count": task_count}
         except Exception as e:
             db_status = {"ok": False, "error": str(e)}
+        db_status["pool"] = db_stats()
 
         return web.json_response({
             "status": "ok",
@@ -136,6 +408,25 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         except RuntimeError as e:
             return web.json_response({"error": str(e)}, status=503)
 
+    async def handle_wait_token(request):
+        """GET /api/token/wait?task_id=...&timeout=S — block until the task
+        is registered and its token is ready (prefetched on registration).
+        """
+        task_id = request.query.get("task_id", "")
+        if not task_id:
+            return web.json_response({"error": "task_id required"}, status=400)
+        try:
+            timeout = min(max(float(request.query.get("timeout", 30)), 0), TOKEN_WAIT_MAX)
+        except ValueError:
+            return web.json_response({"error": "timeout must be a number"}, status=400)
+        try:
+            token_data = await broker.wait_for_token(task_id, timeout)
+            return web.json_response(token_data)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=403)
+        except RuntimeError as e:
+            return web.json_response({"error": str(e)}, status=503)
+
     async def handle_token_audit(request):
         task_id = request.query.get("task_id")
         entries = await broker.get_audit_log(task_id=task_id)
@@ -149,47 +440,11 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         except Exception:
             return web.json_response({"error": "invalid JSON"}, status=400)
 
-        name = data.get("name", "").strip()
-        if not name:
-            return web.json_response({"error": "name is required"}, status=400)
-
-        task_type = data.get("type", "swe")
-        status = data.get("status", "queued")
-        if status not in VALID_TASK_STATUSES:
-            return web.json_response({"error": f"invalid status: {status}"}, status=400)
-
-        repos = data.get("repos")
-        repos_json = json.dumps(repos) if repos else None
+        params, error = _parse_new_task(data)
+        if error:
+            return web.json_response({"error": error}, status=400)
 
-        db = await get_db()
-        async with db.execute(
-            """INSERT INTO tasks (name, slug, type, status, priority, model,
-               assigned_to, repos, discord_thread_id, estimate_minutes,
-               requires_qa, workflow)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                name,
-                data.get("slug"),
-                task_type,
-                status,
-                data.get("priority", "normal"),
-                data.get("model"),
-                data.get("assigned_to"),
-                repos_json,
-                data.get("discord_thread_id"),
-                data.get("estimate_minutes"),
-                1 if data.get("requires_qa") else 0,
-                data.get("workflow"),
-            ),
-        ) as cur:
-            task_id = cur.lastrowid
-
-        # Log creation event
-        await db.execute(
-            "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
-            (task_id, "created", f"Task created with status={status}", data.get("actor")),
-        )
-        await db.commit()
+        task_id = await run_write(lambda db: _insert_task(db, params, data.get("actor")))
 
         # Trigger vault sync on task creation
         if sync_daemon:
@@ -201,7 +456,14 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         )
 
     async def handle_list_tasks(request):
-        db = await get_db()
+        """GET /api/v1/tasks — list tasks, newest first by default.
+
+        Keyset pagination: ?after_id=N walks ascending from N, ?before_id=N
+        walks descending from N. When a page is full, the id to pass to the
+        next request is returned in the X-Next-Cursor header. ?fields=a,b
+        projects columns (id is always included); ?updated_since= filters on
+        updated_at (SQLite datetime format).
+        """
         conditions = []
         params = []
 
@@ -215,39 +477,101 @@ def build_app(runner: JobRunner, broker: TokenBroker,
             conditions.append("type = ?")
             params.append(type_filter)
 
+        updated_since = request.query.get("updated_since")
+        if updated_since:
+            conditions.append("updated_at > ?")
+            params.append(updated_since)
+
+        try:
+            after_id = request.query.get("after_id")
+            before_id = request.query.get("before_id")
+            if after_id and before_id:
+                return web.json_response(
+                    {"error": "after_id and before_id are mutually exclusive"}, status=400
+                )
+            order = "DESC"
+            if after_id:
+                conditions.append("id > ?")
+                params.append(int(after_id))
+                order = "ASC"
+            elif before_id:
+                conditions.append("id < ?")
+                params.append(int(before_id))
+            limit = int(request.query.get("limit", 100))
+        except ValueError:
+            return web.json_response({"error": "limit/after_id/before_id must be integers"}, status=400)
+        if not 1 <= limit <= TASK_LIST_MAX:
+            return web.json_response({"error": f"limit must be 1..{TASK_LIST_MAX}"}, status=400)
+        params.append(limit)
+
+        fields = TASK_LIST_FIELDS
+        if request.query.get("fields"):
+            requested = [f.strip() for f in request.query["fields"].split(",") if f.strip()]
+            unknown = [f for f in requested if f not in TASK_LIST_FIELDS]
+            if unknown:
+                return web.json_response({"error": f"unknown fields: {', '.join(unknown)}"}, status=400)
+            fields = ("id", *(f for f in requested if f != "id"))
+
         where = ""
         if conditions:
             where = "WHERE " + " AND ".join(conditions)
 
-        limit = min(int(request.query.get("limit", 100)), 500)
-        params.append(limit)
-
-        query = f"""SELECT id, name, slug, type, status, priority, model,
-                    assigned_to, repos, discord_thread_id, estimate_minutes,
-                    requires_qa, workflow, created_at, updated_at, queued_at,
-                    assigned_at, completed_at
+        query = f"""SELECT {', '.join(fields)}
                     FROM tasks {where}
-                    ORDER BY id DESC LIMIT ?"""
+                    ORDER BY id {order} LIMIT ?"""
 
-        async with db.execute(query, params) as cur:
-            rows = await cur.fetchall()
+        async with read_db() as db:
+            async with db.execute(query, params) as cur:
+                rows = await cur.fetchall()
 
         tasks = []
         for row in rows:
             task = dict(row)
             task["task_id"] = f"T{task['id']}"
-            task["requires_qa"] = bool(task["requires_qa"])
-            if task["repos"]:
+            if "requires_qa" in task:
+                task["requires_qa"] = bool(task["requires_qa"])
+            if task.get("repos"):
                 task["repos"] = json.loads(task["repos"])
             tasks.append(task)
 
-        return web.json_response(tasks)
+        headers = {}
+        if tasks and len(tasks) == limit:
+            headers["X-Next-Cursor"] = str(tasks[-1]["id"])
+        return web.json_response(tasks, headers=headers)
+
+    async def handle_task_stats(request):
+        """GET /api/v1/tasks/stats — counts by status/type/priority + queue age.
+
+        Counts come from the trigger-maintained task_counts table; queue age
+        percentiles (seconds since queued_at) cover currently queued tasks.
+        """
+        async with read_db() as db:
+            counts = await task_counts(db)
+            async with db.execute(
+                """SELECT (julianday('now') - julianday(queued_at)) * 86400 AS age
+                   FROM tasks WHERE status = 'queued' ORDER BY queued_at DESC"""
+            ) as cur:
+                ages = [r["age"] for r in await cur.fetchall()]
+
+        return web.json_response({
+            "total": sum(counts["status"].values()),
+            "by_status": counts["status"],
+            "by_type": counts["type"],
+            "by_priority": counts["priority"],
+            "queue_age_seconds": {
+                "count": len(ages),
+                "p50": _percentile(ages, 50),
+                "p90": _percentile(ages, 90),
+                "p99": _percentile(ages, 99),
+                "max": round(ages[-1], 1) if ages else None,
+            },
+        })
 
     async def handle_get_task(request):
         task_id = int(request.match_info["id"])
-        db = await get_db()
-        async with db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)) as cur:
-            row = await cur.fetchone()
+        async with read_db() as db:
+            async with db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)) as cur:
+                row = await cur.fetchone()
         if not row:
             return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
 
@@ -265,76 +589,251 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         except Exception:
             return web.json_response({"error": "invalid JSON"}, status=400)
 
-        db = await get_db()
-        async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
-            if not await cur.fetchone():
-                return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
-
-        # Filter to whitelisted fields
-        updates = {}
-        for key, val in data.items():
-            if key in TASK_PATCH_FIELDS:
-                if key in ("repos", "broker_repos") and isinstance(val, list):
-                    updates[key] = json.dumps(val)
-                elif key == "requires_qa":
-                    updates[key] = 1 if val else 0
-                elif key == "status" and val not in VALID_TASK_STATUSES:
-                    return web.json_response({"error": f"invalid status: {val}"}, status=400)
-                else:
-                    updates[key] = val
+        update, error = _parse_task_update(data)
+        if error:
+            return web.json_response({"error": error}, status=400)
+        changed = update[2]
 
-        if not updates:
-            return web.json_response({"error": "no valid fields to update"}, status=400)
+        if not await run_write(lambda db: _apply_task_update(db, task_id, update, data.get("actor"))):
+            return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
 
-        updates["updated_at"] = "datetime('now')"
-        sets = []
-        vals = []
-        for k, v in updates.items():
-            if v == "datetime('now')":
-                sets.append(f"{k} = datetime('now')")
-            else:
-                sets.append(f"{k} = ?")
-                vals.append(v)
-        vals.append(task_id)
+        if "broker_repos" in changed:
+            broker.prefetch(_task_repos(data["broker_repos"]))
+        elif BROKER_ALIAS_FIELDS & set(changed):
+            broker.invalidate_aliases()
+
+        # Trigger vault sync on status or assignment changes
+        if sync_daemon and ({"status", "assigned_to"} & set(changed)):
+            sync_daemon.request_sync()
+
+        return web.json_response({"id": task_id, "task_id": f"T{task_id}", "updated": changed})
+
+    async def handle_next_tasks(request):
+        """GET /api/v1/tasks/next — top runnable tasks in dispatch order.
 
-        await db.execute(f"UPDATE tasks SET {', '.join(sets)} WHERE id = ?", vals)
+        Read-only preview of what a claim would return.
+        ?limit=N&types=a,b&per_type=N&per_repo=N (quotas cap concurrently
+        active tasks per type / per repo, 0 = no cap).
+        """
+        types = request.query.get("types")
+        params, error = _parse_schedule_params(
+            request.query.get("limit", 10),
+            [t for t in types.split(",") if t] if types else None,
+            request.query.get("per_type"),
+            request.query.get("per_repo"),
+        )
+        if error:
+            return web.json_response({"error": error}, status=400)
+
+        async with read_db() as db:
+            tasks = await _select_runnable(db, *params)
+        return web.json_response([_format_task(t) for t in tasks])
+
+    async def handle_claim_tasks(request):
+        """POST /api/v1/tasks/claim — atomically assign runnable tasks.
+
+        Body: {"claimant": str, "limit": N, "lease_seconds": S,
+        "types": [...], "per_type": N, "per_repo": N}; selection and quotas
+        as for GET /api/v1/tasks/next.
+        Claimed tasks become active/assigned_to=claimant with
+        lease_expires_at set; the claimant confirms by PATCHing
+        lease_expires_at to null (e.g. with the spawned job name), or
+        releases by PATCHing status back to queued (a future
+        lease_expires_at on a queued task defers it until then).
+        Unconfirmed claims are claimable again once the lease expires
+        ("reclaimed": true).
+        """
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"error": "invalid JSON"}, status=400)
 
-        # Log update event
-        changed = [k for k in updates if k != "updated_at"]
-        await db.execute(
-            "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
-            (task_id, "updated", f"Updated: {', '.join(changed)}", data.get("actor")),
+        claimant = data.get("claimant")
+        if not isinstance(claimant, str) or not claimant:
+            return web.json_response({"error": "claimant is required"}, status=400)
+        try:
+            lease_seconds = int(data.get("lease_seconds", CLAIM_LEASE_DEFAULT))
+        except (TypeError, ValueError):
+            return web.json_response({"error": "lease_seconds must be an integer"}, status=400)
+        if not 1 <= lease_seconds <= CLAIM_LEASE_MAX:
+            return web.json_response({"error": f"lease_seconds must be 1..{CLAIM_LEASE_MAX}"}, status=400)
+        params, error = _parse_schedule_params(
+            data.get("limit", 1), data.get("types"), data.get("per_type"), data.get("per_repo"),
         )
-        await db.commit()
+        if error:
+            return web.json_response({"error": error}, status=400)
 
-        # Trigger vault sync on status or assignment changes
-        if sync_daemon and ({"status", "assigned_to"} & updates.keys()):
+        tasks = await run_write(lambda db: _claim_tasks(db, claimant, lease_seconds, *params))
+
+        if tasks:
+            # Claims reassign assigned_to
+            broker.invalidate_aliases()
+        if tasks and sync_daemon:
             sync_daemon.request_sync()
 
-        return web.json_response({"id": task_id, "task_id": f"T{task_id}", "updated": changed})
+        return web.json_response({"claimed": len(tasks), "tasks": tasks})
+
+    async def _read_batch(request, key: str = "tasks") -> tuple[list | None, web.Response | None]:
+        try:
+            data = await request.json()
+        except Exception:
+            return None, web.json_response({"error": "invalid JSON"}, status=400)
+        items = data.get(key) if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return None, web.json_response({"error": f"{key} must be a non-empty list"}, status=400)
+        if len(items) > BATCH_MAX_ITEMS:
+            return None, web.json_response(
+                {"error": f"batch too large ({len(items)} > {BATCH_MAX_ITEMS})"}, status=413
+            )
+        return items, None
+
+    async def handle_create_tasks_batch(request):
+        """POST /api/v1/tasks:batch — create many tasks in one transaction.
+
+        Body: {"tasks": [<create payload>, ...]}. Each item may carry an
+        "events" list of {event_type, detail} logged alongside it.
+        Returns per-item results in request order.
+        """
+        items, error_resp = await _read_batch(request)
+        if error_resp:
+            return error_resp
+
+        results = [None] * len(items)
+        valid = []
+        for i, item in enumerate(items):
+            params, error = _parse_new_task(item) if isinstance(item, dict) else (None, "item must be an object")
+            if error:
+                results[i] = {"index": i, "status": 400, "error": error}
+            else:
+                valid.append((i, item, params))
+
+        async def _insert_all(db):
+            created = []
+            for i, item, params in valid:
+                await db.execute("SAVEPOINT batch_item")
+                try:
+                    task_id = await _insert_task(db, params, item.get("actor"))
+                    for ev in item.get("events") or []:
+                        await db.execute(
+                            "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+                            (task_id, ev["event_type"], ev.get("detail"), ev.get("actor", item.get("actor"))),
+                        )
+                except Exception as e:
+                    await db.execute("ROLLBACK TO batch_item")
+                    await db.execute("RELEASE batch_item")
+                    created.append((i, None, str(e)))
+                else:
+                    await db.execute("RELEASE batch_item")
+                    created.append((i, task_id, None))
+            return created
+
+        created = await run_write(_insert_all) if valid else []
+        for i, task_id, error in created:
+            if error:
+                results[i] = {"index": i, "status": 400, "error": error}
+            else:
+                results[i] = {"index": i, "status": 201, "id": task_id, "task_id": f"T{task_id}"}
+
+        ok = sum(1 for r in results if r["status"] == 201)
+        if ok and sync_daemon:
+            sync_daemon.request_sync()
+
+        return web.json_response({"created": ok, "failed": len(items) - ok, "results": results})
+
+    async def handle_update_tasks_batch(request):
+        """PATCH /api/v1/tasks:batch — update many tasks in one transaction.
+
+        Body: {"tasks": [{"id": 42, <patch fields>}, ...]}. Returns
+        per-item results in request order.
+        """
+        items, error_resp = await _read_batch(request)
+        if error_resp:
+            return error_resp
+
+        results = [None] * len(items)
+        valid = []
+        for i, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[i] = {"index": i, "status": 400, "error": "item must be an object"}
+                continue
+            try:
+                task_id = int(str(item.get("id", "")).lstrip("T"))
+            except ValueError:
+                results[i] = {"index": i, "status": 400, "error": "id is required"}
+                continue
+            update, error = _parse_task_update(item)
+            if error:
+                results[i] = {"index": i, "status": 400, "id": task_id, "error": error}
+            else:
+                valid.append((i, task_id, item, update))
+
+        async def _update_all(db):
+            applied = {}
+            for i, task_id, item, update in valid:
+                await db.execute("SAVEPOINT batch_item")
+                try:
+                    found = await _apply_task_update(db, task_id, update, item.get("actor"))
+                except Exception as e:
+                    await db.execute("ROLLBACK TO batch_item")
+                    await db.execute("RELEASE batch_item")
+                    applied[i] = (False, str(e))
+                else:
+                    await db.execute("RELEASE batch_item")
+                    applied[i] = (found, None)
+            return applied
+
+        needs_sync = False
+        applied = await run_write(_update_all) if valid else {}
+        for i, task_id, item, update in valid:
+            found, error = applied[i]
+            if error:
+                results[i] = {"index": i, "status": 400, "id": task_id, "error": error}
+            elif found:
+                results[i] = {"index": i, "status": 200, "id": task_id,
+                              "task_id": f"T{task_id}", "updated": update[2]}
+                if "broker_repos" in update[2]:
+                    broker.prefetch(_task_repos(item["broker_repos"]))
+                elif BROKER_ALIAS_FIELDS & set(update[2]):
+                    broker.invalidate_aliases()
+                needs_sync = needs_sync or bool({"status", "assigned_to"} & set(update[2]))
+            else:
+                results[i] = {"index": i, "status": 404, "id": task_id,
+                              "error": f"Task T{task_id} not found"}
+
+        if needs_sync and sync_daemon:
+            sync_daemon.request_sync()
+
+        ok = sum(1 for r in results if r["status"] == 200)
+        return web.json_response({"updated": ok, "failed": len(items) - ok, "results": results})
 
     async def handle_cancel_task(request):
         task_id = int(request.match_info["id"])
-        db = await get_db()
-        async with db.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)) as cur:
-            row = await cur.fetchone()
-        if not row:
+
+        async def _cancel(db):
+            async with db.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)) as cur:
+                row = await cur.fetchone()
+            if not row:
+                return None
+            if row["status"] in ("completed", "cancelled"):
+                return row["status"]
+            await db.execute(
+                "UPDATE tasks SET status = 'cancelled', updated_at = datetime('now') WHERE id = ?",
+                (task_id,),
+            )
+            await db.execute(
+                "INSERT INTO task_events (task_id, event_type, detail) VALUES (?, ?, ?)",
+                (task_id, "cancelled", "Task cancelled via API"),
+            )
+            return row["status"]
+
+        prev = await run_write(_cancel)
+        if prev is None:
             return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
-        if row["status"] in ("completed", "cancelled"):
+        if prev in ("completed", "cancelled"):
             return web.json_response(
-                {"error": f"Task T{task_id} is already {row['status']}"}, status=409
+                {"error": f"Task T{task_id} is already {prev}"}, status=409
             )
 
-        await db.execute(
-            "UPDATE tasks SET status = 'cancelled', updated_at = datetime('now') WHERE id = ?",
-            (task_id,),
-        )
-        await db.execute(
-            "INSERT INTO task_events (task_id, event_type, detail) VALUES (?, ?, ?)",
-            (task_id, "cancelled", "Task cancelled via API"),
-        )
-        await db.commit()
-
         # Trigger vault sync on cancellation
         if sync_daemon:
             sync_daemon.request_sync()
@@ -343,14 +842,22 @@ def build_app(runner: JobRunner, broker: TokenBroker,
 
     async def handle_get_task_events(request):
         task_id = int(request.match_info["id"])
-        db = await get_db()
-        async with db.execute(
-            "SELECT * FROM task_events WHERE task_id = ? ORDER BY id DESC", (task_id,)
-        ) as cur:
-            rows = await cur.fetchall()
+        await flush_events()
+        async with read_db() as db:
+            async with db.execute(
+                "SELECT * FROM task_events WHERE task_id = ? ORDER BY id DESC", (task_id,)
+            ) as cur:
+                rows = await cur.fetchall()
         return web.json_response([dict(r) for r in rows])
 
     async def handle_create_task_event(request):
+        """POST /api/v1/tasks/{id}/events — log a task event.
+
+        The event is group-committed with concurrent ones and committed
+        before the 201 response. With "buffered": true the response is a
+        202 as soon as the event is queued (committed within
+        LOBWIFE_EVENT_FLUSH_MS).
+        """
         task_id = int(request.match_info["id"])
         try:
             data = await request.json()
@@ -361,19 +868,139 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         if not event_type:
             return web.json_response({"error": "event_type is required"}, status=400)
 
-        db = await get_db()
-        async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
-            if not await cur.fetchone():
-                return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
+        async with read_db() as db:
+            async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
+                if not await cur.fetchone():
+                    return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
 
-        await db.execute(
-            "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
-            (task_id, event_type, data.get("detail"), data.get("actor")),
-        )
-        await db.commit()
+        buffered = bool(data.get("buffered")) and not data.get("durable")
+        await log_event(task_id, event_type, data.get("detail"), data.get("actor"), durable=not buffered)
 
+        if buffered:
+            return web.json_response({"status": "queued", "task_id": f"T{task_id}"}, status=202)
         return web.json_response({"status": "logged", "task_id": f"T{task_id}"}, status=201)
 
+    async def handle_create_events_batch(request):
+        """POST /api/v1/events:batch — log many task events at once.
+
+        Body: {"events": [{"task_id": 42, "event_type", "detail", "actor",
+        "created_at"}, ...]}; created_at (ISO 8601, UTC if naive) keeps the
+        time the client recorded the event. Returns per-item results in
+        request order once all accepted events are committed.
+        """
+        items, error_resp = await _read_batch(request, key="events")
+        if error_resp:
+            return error_resp
+
+        results = [None] * len(items)
+        parsed = []
+        for i, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[i] = {"index": i, "status": 400, "error": "item must be an object"}
+                continue
+            try:
+                task_id = int(str(item.get("task_id", "")).lstrip("T"))
+            except ValueError:
+                results[i] = {"index": i, "status": 400, "error": "task_id is required"}
+                continue
+            event_type = str(item.get("event_type") or "").strip()
+            if not event_type:
+                results[i] = {"index": i, "status": 400, "error": "event_type is required"}
+                continue
+            created_at = None
+            if item.get("created_at"):
+                try:
+                    ts = datetime.fromisoformat(str(item["created_at"]).replace("Z", "+00:00"))
+                except ValueError:
+                    results[i] = {"index": i, "status": 400, "error": "invalid created_at"}
+                    continue
+                if ts.tzinfo is not None:
+                    ts = ts.astimezone(timezone.utc)
+                created_at = ts.strftime("%Y-%m-%d %H:%M:%S")
+            parsed.append((i, task_id, event_type, item, created_at))
+
+        ids = sorted({p[1] for p in parsed})
+        known = set()
+        if ids:
+            async with read_db() as db:
+                async with db.execute(
+                    f"SELECT id FROM tasks WHERE id IN ({','.join('?' * len(ids))})", ids,
+                ) as cur:
+                    known = {row[0] for row in await cur.fetchall()}
+
+        for i, task_id, event_type, item, created_at in parsed:
+            if task_id not in known:
+                results[i] = {"index": i, "status": 404, "error": f"Task T{task_id} not found"}
+                continue
+            await log_event(task_id, event_type, item.get("detail"), item.get("actor"),
+                            created_at=created_at)
+            results[i] = {"index": i, "status": 201, "task_id": f"T{task_id}"}
+        await flush_events()
+
+        ok = sum(1 for r in results if r["status"] == 201)
+        return web.json_response({"logged": ok, "failed": len(items) - ok, "results": results})
+
+    # === Change feed (/api/v1/changes) ===
+
+    async def handle_changes(request):
+        """GET /api/v1/changes — committed task events after a cursor.
+
+        ?since=<event id> (or Last-Event-ID) resumes from a cursor; without
+        it the feed starts at the current head, i.e. only new events.
+        Long-poll (default): returns {changes, cursor} as soon as events
+        exist, or after ?timeout= seconds with an empty list.
+        SSE (?stream=1 or Accept: text/event-stream): streams events as
+        they commit, each tagged with its id for reconnects.
+        """
+        try:
+            since = request.query.get("since") or request.headers.get("Last-Event-ID")
+            since = int(since) if since else changes_head()
+            limit = int(request.query.get("limit", CHANGES_MAX))
+            timeout = min(float(request.query.get("timeout", 30)), CHANGES_MAX_WAIT)
+        except ValueError:
+            return web.json_response({"error": "since/limit/timeout must be numeric"}, status=400)
+        if not 1 <= limit <= CHANGES_MAX:
+            return web.json_response({"error": f"limit must be 1..{CHANGES_MAX}"}, status=400)
+
+        stream = (request.query.get("stream") in ("1", "true")
+                  or "text/event-stream" in request.headers.get("Accept", ""))
+        if not stream:
+            changes = await read_changes(since, limit=limit, timeout=max(timeout, 0.0))
+            cursor = changes[-1]["id"] if changes else since
+            return web.json_response({"changes": changes, "cursor": cursor})
+
+        resp = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+        await resp.prepare(request)
+        change_streams.add(asyncio.current_task())
+        await resp.write(f"retry: 1000\nevent: cursor\ndata: {since}\n\n".encode())
+
+        cursor = since
+        try:
+            while True:
+                changes = await read_changes(cursor, limit=limit, timeout=CHANGES_KEEPALIVE)
+                if not changes:
+                    await resp.write(b": keepalive\n\n")
+                    continue
+                for change in changes:
+                    data = json.dumps(change)
+                    await resp.write(f"id: {change['id']}\nevent: task_event\ndata: {data}\n\n".encode())
+                cursor = changes[-1]["id"]
+        except (ConnectionResetError, RuntimeError, asyncio.CancelledError):
+            pass  # client went away or daemon shutting down
+        finally:
+            change_streams.discard(asyncio.current_task())
+
+        return resp
+
+    async def close_change_streams(app):
+        """Close open SSE streams so shutdown doesn't wait on idle clients."""
+        for task in list(change_streams):
+            task.cancel()
+
     # === Service tokens (long-running services like lobboss, lobsigliere) ===
 
     async def handle_service_token(request):
@@ -405,25 +1032,29 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         if not repos:
             return web.json_response({"error": "repos required"}, status=400)
 
-        db = await get_db()
-        async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
-            if not await cur.fetchone():
-                return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
-
         now_iso = __import__("datetime").datetime.now(
             __import__("datetime").timezone.utc
         ).isoformat()
-        await db.execute(
-            """UPDATE tasks SET broker_repos = ?, broker_status = 'active',
-               broker_registered_at = ?, updated_at = datetime('now')
-               WHERE id = ?""",
-            (json.dumps(repos), now_iso, task_id),
-        )
-        await db.execute(
-            "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
-            (task_id, "broker_registered", f"repos={repos}", lobster_type),
-        )
-        await db.commit()
+
+        async def _register(db):
+            async with db.execute("SELECT id FROM tasks WHERE id = ?", (task_id,)) as cur:
+                if not await cur.fetchone():
+                    return False
+            await db.execute(
+                """UPDATE tasks SET broker_repos = ?, broker_status = 'active',
+                   broker_registered_at = ?, updated_at = datetime('now')
+                   WHERE id = ?""",
+                (json.dumps(repos), now_iso, task_id),
+            )
+            await db.execute(
+                "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+                (task_id, "broker_registered", f"repos={repos}", lobster_type),
+            )
+            return True
+
+        if not await run_write(_register):
+            return web.json_response({"error": f"Task T{task_id} not found"}, status=404)
+        broker.prefetch(repos)
         return web.json_response({"status": "registered", "task_id": f"T{task_id}"})
 
     # === Broker compat shims (old routes → tasks table lookup) ===
@@ -445,42 +1076,45 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         if not repos:
             return web.json_response({"error": "repos required"}, status=400)
 
-        db = await get_db()
-
-        # Try to find by slug or name in tasks table
-        db_task_id = None
-        for field in ("slug", "name"):
-            async with db.execute(
-                f"SELECT id FROM tasks WHERE {field} = ?", (slug,)
-            ) as cur:
-                row = await cur.fetchone()
-                if row:
-                    db_task_id = row["id"]
-                    break
-
-        # Also try T-format: "T42" → id=42
-        if db_task_id is None and slug.startswith("T") and slug[1:].isdigit():
-            tid = int(slug[1:])
-            async with db.execute("SELECT id FROM tasks WHERE id = ?", (tid,)) as cur:
-                row = await cur.fetchone()
-                if row:
-                    db_task_id = row["id"]
+        async with read_db() as db:
+            # Try to find by slug or name in tasks table
+            db_task_id = None
+            for field in ("slug", "name"):
+                async with db.execute(
+                    f"SELECT id FROM tasks WHERE {field} = ?", (slug,)
+                ) as cur:
+                    row = await cur.fetchone()
+                    if row:
+                        db_task_id = row["id"]
+                        break
+
+            # Also try T-format: "T42" → id=42
+            if db_task_id is None and slug.startswith("T") and slug[1:].isdigit():
+                tid = int(slug[1:])
+                async with db.execute("SELECT id FROM tasks WHERE id = ?", (tid,)) as cur:
+                    row = await cur.fetchone()
+                    if row:
+                        db_task_id = row["id"]
 
         if db_task_id is not None:
             now_iso = __import__("datetime").datetime.now(
                 __import__("datetime").timezone.utc
             ).isoformat()
-            await db.execute(
-                """UPDATE tasks SET broker_repos = ?, broker_status = 'active',
-                   broker_registered_at = ?, updated_at = datetime('now')
-                   WHERE id = ?""",
-                (json.dumps(repos), now_iso, db_task_id),
-            )
-            await db.execute(
-                "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
-                (db_task_id, "broker_registered", f"repos={repos} (compat)", lobster_type),
-            )
-            await db.commit()
+
+            async def _register(db):
+                await db.execute(
+                    """UPDATE tasks SET broker_repos = ?, broker_status = 'active',
+                       broker_registered_at = ?, updated_at = datetime('now')
+                       WHERE id = ?""",
+                    (json.dumps(repos), now_iso, db_task_id),
+                )
+                await db.execute(
+                    "INSERT INTO task_events (task_id, event_type, detail, actor) VALUES (?, ?, ?, ?)",
+                    (db_task_id, "broker_registered", f"repos={repos} (compat)", lobster_type),
+                )
+
+            await run_write(_register)
+            broker.prefetch(repos)
             return web.json_response({"status": "registered", "task_id": slug})
 
         # Fall back to broker_tasks for legacy entries
@@ -517,14 +1151,18 @@ def build_app(runner: JobRunner, broker: TokenBroker,
         return web.json_response({
             "enabled": True,
             "last_sync": sync_daemon._last_sync,
+            "cursor": sync_daemon._cursor,
             "running": sync_daemon._running,
+            **sync_daemon.stats(),
         })
 
     async def handle_sync_trigger(request):
+        """POST /api/v1/sync/trigger — sync now; ?full=1 rewrites every task file."""
         if not sync_daemon:
             return web.json_response({"error": "sync daemon not enabled"}, status=503)
-        sync_daemon.request_sync()
-        return web.json_response({"status": "sync requested"})
+        full = request.query.get("full", "").lower() in ("1", "true", "yes")
+        sync_daemon.request_sync(full=full)
+        return web.json_response({"status": "full resync requested" if full else "sync requested"})
 
     # === Routes ===
 
@@ -544,6 +1182,7 @@ def build_app(runner: JobRunner, broker: TokenBroker,
     app.router.add_delete("/api/tasks/{task_id}", handle_deregister_task)
     app.router.add_get("/api/tasks", handle_list_broker_tasks)
     app.router.add_post("/api/token", handle_get_token_compat)
+    app.router.add_get("/api/token/wait", handle_wait_token)
     app.router.add_get("/api/token/audit", handle_token_audit)
 
     # Service tokens (lobboss, lobsigliere)
@@ -552,12 +1191,22 @@ def build_app(runner: JobRunner, broker: TokenBroker,
     # Task CRUD (new, versioned)
     app.router.add_post("/api/v1/tasks", handle_create_task)
     app.router.add_get("/api/v1/tasks", handle_list_tasks)
+    app.router.add_post("/api/v1/tasks:batch", handle_create_tasks_batch)
+    app.router.add_patch("/api/v1/tasks:batch", handle_update_tasks_batch)
+    app.router.add_get("/api/v1/tasks/stats", handle_task_stats)
+    app.router.add_get("/api/v1/tasks/next", handle_next_tasks)
+    app.router.add_post("/api/v1/tasks/claim", handle_claim_tasks)
     app.router.add_get("/api/v1/tasks/{id}", handle_get_task)
     app.router.add_patch("/api/v1/tasks/{id}", handle_update_task)
     app.router.add_delete("/api/v1/tasks/{id}", handle_cancel_task)
     app.router.add_get("/api/v1/tasks/{id}/events", handle_get_task_events)
     app.router.add_post("/api/v1/tasks/{id}/events", handle_create_task_event)
     app.router.add_post("/api/v1/tasks/{id}/register", handle_register_task_v1)
+    app.router.add_post("/api/v1/events:batch", handle_create_events_batch)
+
+    # Change feed
+    app.router.add_get("/api/v1/changes", handle_changes)
+    app.on_shutdown.append(close_change_streams)
 
     # Vault sync
     app.router.add_get("/api/v1/sync", handle_sync_status)
@@ -5,17 +5,21 @@ persistence with broker_tasks and token_audit tables.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
+import gzip
 import json
 import logging
+import math
 import os
 import time
-from datetime import datetime, timezone
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
 
-from lobwife_db import get_db
+from lobwife_db import read_db, run_write
 
 try:
     import jwt as pyjwt
@@ -25,7 +29,69 @@ except ImportError:
 log = logging.getLogger("lobwife")
 
 TASK_MAX_AGE_HOURS = 24
-AUDIT_MAX_ENTRIES = 500
+
+# token_audit retention, enforced by compact_audit() from the maintenance
+# loop rather than on every insert. Rows beyond the newest
+# AUDIT_MAX_ENTRIES, or older than AUDIT_MAX_AGE_DAYS (0 = no age limit),
+# are removed AUDIT_COMPACT_BATCH at a time; with LOBWIFE_AUDIT_ARCHIVE_DIR
+# set they are first appended to monthly token-audit-YYYY-MM.jsonl.gz files.
+AUDIT_MAX_ENTRIES = int(os.environ.get("LOBWIFE_AUDIT_MAX_ENTRIES", "500"))
+AUDIT_MAX_AGE_DAYS = int(os.environ.get("LOBWIFE_AUDIT_MAX_AGE_DAYS", "0"))
+AUDIT_ARCHIVE_DIR = os.environ.get("LOBWIFE_AUDIT_ARCHIVE_DIR", "")
+AUDIT_COMPACT_BATCH = 500
+
+# Installation tokens live 1h; reuse a cached one until this many seconds
+# before it expires so callers always get at least this much lifetime
+TOKEN_REFRESH_MARGIN = 600
+
+# App JWTs are valid for 9 min (exp = now + 540); re-sign this long before
+JWT_REFRESH_MARGIN = 60
+
+GITHUB_API = "https://api.github.com"
+ALIAS_CACHE_MAX = 4096
+
+# One indexed lookup (rowid + idx_tasks_slug/name/assigned_to) in the old
+# precedence order: T-id, slug, name, assigned_to
+FIND_BROKER_TASK_SQL = """
+    SELECT * FROM tasks
+    WHERE broker_repos IS NOT NULL
+      AND (id = :id OR slug = :ref OR name = :ref OR assigned_to = :ref)
+    ORDER BY CASE WHEN id = :id THEN 0 WHEN slug = :ref THEN 1
+                  WHEN name = :ref THEN 2 ELSE 3 END
+    LIMIT 1"""
+LATENCY_SAMPLES = 200
+
+TOKEN_PERMISSIONS = {
+    "contents": "write",
+    "pull_requests": "write",
+    "metadata": "read",
+}
+
+
+class TaskNotRegistered(ValueError):
+    """No broker registration exists for the task (yet)."""
+
+
+class _PhaseLatency:
+    """Recent latency samples (ms) for one phase of token creation."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.samples.append(seconds * 1000)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 1)
+
+        return {"count": self.count, "p50_ms": pct(50), "p95_ms": pct(95), "max_ms": pct(100)}
 
 
 class TokenBroker:
@@ -35,6 +101,31 @@ class TokenBroker:
         self.app_id = os.environ.get("GH_APP_ID", "")
         self.install_id = os.environ.get("GH_APP_INSTALL_ID", "")
         self.pem_key = self._load_pem()
+        # Scoped tokens keyed by normalized repo set (("*",) = all repos);
+        # concurrent misses for one key share a single mint
+        self._token_cache: dict[tuple[str, ...], tuple[dict, float]] = {}
+        self._token_inflight: dict[tuple[str, ...], asyncio.Task] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_shared = 0
+        self.prefetched = 0
+        # Task reference (T-id, slug, name, job name) -> tasks.id, LRU;
+        # cleared whenever a write could give a reference a higher-precedence match
+        self._aliases: OrderedDict[str, int] = OrderedDict()
+        self.alias_hits = 0
+        self.alias_misses = 0
+        self.audit_compacted = 0
+        self.audit_archived = 0
+        # Set (and replaced) on every registration to wake wait_for_token
+        self._registered = asyncio.Event()
+        self._prefetches: set[asyncio.Task] = set()
+        # Reused app JWT and a pooled keep-alive session to api.github.com
+        self._app_jwt: str | None = None
+        self._app_jwt_exp = 0
+        self._gh_session: ClientSession | None = None
+        self.latency = {
+            phase: _PhaseLatency() for phase in ("sign", "connect", "request", "total")
+        }
         if self.pem_key:
             log.info("Token broker enabled (app_id=%s)", self.app_id)
         else:
@@ -64,172 +155,297 @@ class TokenBroker:
         payload = {"iat": now - 60, "exp": now + 540, "iss": self.app_id}
         return pyjwt.encode(payload, self.pem_key, algorithm="RS256")
 
+    def _app_token(self) -> str:
+        """The app JWT, re-signed only when close to expiry."""
+        if self._app_jwt is None or time.time() > self._app_jwt_exp - JWT_REFRESH_MARGIN:
+            start = time.monotonic()
+            self._app_jwt = self._generate_jwt()
+            self._app_jwt_exp = int(time.time()) + 540
+            self.latency["sign"].observe(time.monotonic() - start)
+        return self._app_jwt
+
+    def _github_session(self) -> ClientSession:
+        if self._gh_session is None or self._gh_session.closed:
+            trace = TraceConfig()
+
+            async def _conn_start(session, ctx, params):
+                ctx.connect_started = time.monotonic()
+
+            async def _conn_end(session, ctx, params):
+                self.latency["connect"].observe(time.monotonic() - ctx.connect_started)
+
+            trace.on_connection_create_start.append(_conn_start)
+            trace.on_connection_create_end.append(_conn_end)
+            self._gh_session = ClientSession(
+                base_url=GITHUB_API,
+                connector=TCPConnector(limit=10, keepalive_timeout=60),
+                timeout=ClientTimeout(total=30),
+                headers={"Accept": "application/vnd.github.v3+json"},
+                trace_configs=[trace],
+            )
+        return self._gh_session
+
+    async def close(self):
+        """Cancel background token prefetches, then close the pooled GitHub session."""
+        pending = [*self._prefetches, *self._token_inflight.values()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if self._gh_session is not None and not self._gh_session.closed:
+            await self._gh_session.close()
+
     async def _create_installation_token(self, body: dict) -> dict:
         """Create a GitHub App installation token with the given request body."""
-        app_jwt = self._generate_jwt()
-        url = f"https://api.github.com/app/installations/{self.install_id}/access_tokens"
-        async with ClientSession() as session:
-            async with session.post(
-                url,
-                json=body,
-                headers={
-                    "Authorization": f"Bearer {app_jwt}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-            ) as resp:
-                if resp.status != 201:
-                    text = await resp.text()
-                    raise RuntimeError(f"GitHub API {resp.status}: {text[:300]}")
-                data = await resp.json()
-                return {"token": data["token"], "expires_at": data["expires_at"]}
+        start = time.monotonic()
+        app_jwt = self._app_token()
+        session = self._github_session()
+        request_start = time.monotonic()
+        async with session.post(
+            f"/app/installations/{self.install_id}/access_tokens",
+            json=body,
+            headers={"Authorization": f"Bearer {app_jwt}"},
+        ) as resp:
+            if resp.status != 201:
+                text = await resp.text()
+                if resp.status == 401:
+                    # Force a fresh JWT next time (clock skew, rotated key)
+                    self._app_jwt = None
+                raise RuntimeError(f"GitHub API {resp.status}: {text[:300]}")
+            data = await resp.json()
+        now = time.monotonic()
+        self.latency["request"].observe(now - request_start)
+        self.latency["total"].observe(now - start)
+        return {"token": data["token"], "expires_at": data["expires_at"]}
+
+    async def _cached_token(self, key: tuple[str, ...], body: dict) -> dict:
+        """Return a cached token for key, minting one if missing or near expiry."""
+        cached = self._token_cache.get(key)
+        if cached and cached[1] - time.time() > TOKEN_REFRESH_MARGIN:
+            self.cache_hits += 1
+            return cached[0]
+
+        inflight = self._token_inflight.get(key)
+        if inflight is not None:
+            self.cache_shared += 1
+            return await asyncio.shield(inflight)
+
+        self.cache_misses += 1
+        task = asyncio.ensure_future(self._create_installation_token(body))
+        self._token_inflight[key] = task
+        # The mint outlives a cancelled caller, so it caches its own result
+        task.add_done_callback(lambda t: self._mint_done(key, t))
+        return await asyncio.shield(task)
+
+    def _mint_done(self, key: tuple[str, ...], task: asyncio.Task) -> None:
+        """Clear the in-flight entry and cache a successful mint."""
+        if self._token_inflight.get(key) is task:
+            del self._token_inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        token_data = task.result()
+        now = time.time()
+        for k in [k for k, (_, exp) in self._token_cache.items() if exp <= now]:
+            del self._token_cache[k]
+        expires = datetime.fromisoformat(token_data["expires_at"].replace("Z", "+00:00"))
+        self._token_cache[key] = (token_data, expires.timestamp())
 
     async def create_scoped_token(self, repos: list[str]) -> dict:
-        repo_names = [r.split("/")[-1] for r in repos]
-        return await self._create_installation_token({
-            "repositories": repo_names,
-            "permissions": {
-                "contents": "write",
-                "pull_requests": "write",
-                "metadata": "read",
-            },
+        # Key on case-folded names (GitHub repo names are case-insensitive)
+        names = {r.split("/")[-1].lower(): r.split("/")[-1] for r in repos}
+        key = tuple(sorted(names))
+        return await self._cached_token(key, {
+            "repositories": [names[k] for k in key],
+            "permissions": TOKEN_PERMISSIONS,
         })
 
     async def create_all_repo_token(self) -> dict:
         """Create a token scoped to ALL repos the app can access."""
-        return await self._create_installation_token({
-            "permissions": {
-                "contents": "write",
-                "pull_requests": "write",
-                "metadata": "read",
-            },
-        })
+        return await self._cached_token(("*",), {"permissions": TOKEN_PERMISSIONS})
+
+    def cache_stats(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses + self.cache_shared
+        return {
+            "entries": len(self._token_cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "shared": self.cache_shared,
+            "prefetched": self.prefetched,
+            "hit_rate": round((self.cache_hits + self.cache_shared) / lookups, 3) if lookups else None,
+        }
 
     async def create_service_token(self, service: str) -> dict:
         """Create an all-repo token for a long-running service."""
         token_data = await self.create_all_repo_token()
-        db = await get_db()
-        await self._audit(db, "service_token_issued", service, ["*"])
-        await db.commit()
+        await run_write(lambda db: self._audit(db, "service_token_issued", service, ["*"]))
         return token_data
 
     async def register_task(self, task_id: str, repos: list[str], lobster_type: str):
-        db = await get_db()
         now_iso = datetime.now(timezone.utc).isoformat()
-        await db.execute(
-            """INSERT OR REPLACE INTO broker_tasks
-               (task_id, repos, lobster_type, registered_at, status, token_count)
-               VALUES (?, ?, ?, ?, 'active', 0)""",
-            (task_id, json.dumps(repos), lobster_type, now_iso),
-        )
-        await self._audit(db, "task_registered", task_id, repos)
-        await db.commit()
+
+        async def _register(db):
+            await db.execute(
+                """INSERT OR REPLACE INTO broker_tasks
+                   (task_id, repos, lobster_type, registered_at, status, token_count)
+                   VALUES (?, ?, ?, ?, 'active', 0)""",
+                (task_id, json.dumps(repos), lobster_type, now_iso),
+            )
+            await self._audit(db, "task_registered", task_id, repos)
+
+        await run_write(_register)
         log.info("Registered task %s: repos=%s type=%s", task_id, repos, lobster_type)
+        self.prefetch(repos)
+
+    def prefetch(self, repos: list[str]) -> None:
+        """Note a new registration: wake token waiters and mint its token
+        in the background so the lobster's first request is a cache hit."""
+        # A newly registered task may outrank a cached alias's match
+        self.invalidate_aliases()
+        registered, self._registered = self._registered, asyncio.Event()
+        registered.set()
+        if self.enabled and repos:
+            task = asyncio.create_task(self._prefetch(repos))
+            self._prefetches.add(task)
+            task.add_done_callback(self._prefetches.discard)
+
+    async def _prefetch(self, repos: list[str]):
+        try:
+            await self.create_scoped_token(repos)
+            self.prefetched += 1
+        except Exception as e:
+            log.warning("Token prefetch failed for %s: %s", repos, e)
+
+    async def wait_for_token(self, task_id: str, timeout: float) -> dict:
+        """get_token_for_task, waiting up to timeout seconds for the task
+        to be registered instead of failing immediately."""
+        deadline = time.monotonic() + timeout
+        while True:
+            registered = self._registered
+            try:
+                return await self.get_token_for_task(task_id)
+            except TaskNotRegistered:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+                try:
+                    await asyncio.wait_for(registered.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
 
     async def deregister_task(self, task_id: str):
-        db = await get_db()
-        async with db.execute(
-            "SELECT repos FROM broker_tasks WHERE task_id = ?", (task_id,)
-        ) as cur:
-            row = await cur.fetchone()
-        if row:
+        async def _deregister(db):
+            async with db.execute(
+                "SELECT repos FROM broker_tasks WHERE task_id = ?", (task_id,)
+            ) as cur:
+                row = await cur.fetchone()
+            if not row:
+                return False
             repos = json.loads(row["repos"])
             await self._audit(db, "task_deregistered", task_id, repos)
             await db.execute("DELETE FROM broker_tasks WHERE task_id = ?", (task_id,))
-            await db.commit()
+            return True
+
+        if await run_write(_deregister):
             log.info("Deregistered task %s", task_id)
 
     async def get_token_for_task(self, task_id: str) -> dict:
         if not self.enabled:
             raise RuntimeError("Token broker not configured (no PEM key)")
-        db = await get_db()
 
         # Try tasks table first (unified broker fields)
-        task_row = await self._find_task_with_broker(db, task_id)
+        async with read_db() as db:
+            task_row = await self._find_task_with_broker(db, task_id)
+            row = None
+            if not task_row:
+                # Fall back to broker_tasks for legacy entries
+                async with db.execute(
+                    "SELECT * FROM broker_tasks WHERE task_id = ?", (task_id,)
+                ) as cur:
+                    row = await cur.fetchone()
+
         if task_row:
             repos = json.loads(task_row["broker_repos"])
             if task_row["broker_status"] != "active":
                 raise ValueError(f"Task {task_id} broker is {task_row['broker_status']}, not active")
             token_data = await self.create_scoped_token(repos)
-            await db.execute(
-                "UPDATE tasks SET token_count = token_count + 1 WHERE id = ?",
-                (task_row["id"],),
-            )
-            await self._audit(db, "token_issued", task_id, repos)
-            await db.commit()
+
+            async def _record(db):
+                await db.execute(
+                    "UPDATE tasks SET token_count = token_count + 1 WHERE id = ?",
+                    (task_row["id"],),
+                )
+                await self._audit(db, "token_issued", task_id, repos)
+
+            await run_write(_record)
             return token_data
 
-        # Fall back to broker_tasks for legacy entries
-        async with db.execute(
-            "SELECT * FROM broker_tasks WHERE task_id = ?", (task_id,)
-        ) as cur:
-            row = await cur.fetchone()
         if not row:
-            raise ValueError(f"Task {task_id} not registered")
+            raise TaskNotRegistered(f"Task {task_id} not registered")
         if row["status"] != "active":
             raise ValueError(f"Task {task_id} is {row['status']}, not active")
         repos = json.loads(row["repos"])
         token_data = await self.create_scoped_token(repos)
-        await db.execute(
-            "UPDATE broker_tasks SET token_count = token_count + 1 WHERE task_id = ?",
-            (task_id,),
-        )
-        await self._audit(db, "token_issued", task_id, repos)
-        await db.commit()
+
+        async def _record_legacy(db):
+            await db.execute(
+                "UPDATE broker_tasks SET token_count = token_count + 1 WHERE task_id = ?",
+                (task_id,),
+            )
+            await self._audit(db, "token_issued", task_id, repos)
+
+        await run_write(_record_legacy)
         return token_data
 
-    async def _find_task_with_broker(self, db, task_id: str):
-        """Find a task with broker_repos set, by slug, name, or T-format ID."""
-        # Try T-format: "T42" → id=42
-        if task_id.startswith("T") and task_id[1:].isdigit():
-            tid = int(task_id[1:])
-            async with db.execute(
-                "SELECT * FROM tasks WHERE id = ? AND broker_repos IS NOT NULL", (tid,)
-            ) as cur:
-                row = await cur.fetchone()
-                if row:
-                    return row
+    def invalidate_aliases(self) -> None:
+        """Drop cached task references (after a registration, or a write to
+        a task's slug, name or assigned_to)."""
+        self._aliases.clear()
 
-        # Try slug or name match
-        for field in ("slug", "name"):
+    async def _find_task_with_broker(self, db, task_id: str):
+        """Find a task with broker_repos set, by T-format ID, slug, name, or
+        assigned_to (the job name git-credential-lobwife may pass)."""
+        cached = self._aliases.get(task_id)
+        if cached is not None:
             async with db.execute(
-                f"SELECT * FROM tasks WHERE {field} = ? AND broker_repos IS NOT NULL",
-                (task_id,),
+                "SELECT * FROM tasks WHERE id = ? AND broker_repos IS NOT NULL", (cached,)
             ) as cur:
                 row = await cur.fetchone()
-                if row:
-                    return row
-
-        # Try job-name based match: "lobster-swe-t42" → extract task ref
-        # The task_id from git-credential-lobwife is the original task_id string
-        # passed to the job, so also try matching assigned_to
-        async with db.execute(
-            "SELECT * FROM tasks WHERE assigned_to = ? AND broker_repos IS NOT NULL",
-            (task_id,),
-        ) as cur:
-            row = await cur.fetchone()
-            if row:
+            # The cached task may have moved off this reference (requeue
+            # reassigns); new higher-precedence matches invalidate the cache
+            if row and task_id in (f"T{row['id']}", row["slug"], row["name"], row["assigned_to"]):
+                self._aliases.move_to_end(task_id)
+                self.alias_hits += 1
                 return row
+            del self._aliases[task_id]
 
-        return None
+        self.alias_misses += 1
+        tid = int(task_id[1:]) if task_id.startswith("T") and task_id[1:].isdigit() else None
+        async with db.execute(FIND_BROKER_TASK_SQL, {"id": tid, "ref": task_id}) as cur:
+            row = await cur.fetchone()
+        if row:
+            self._aliases[task_id] = row["id"]
+            if len(self._aliases) > ALIAS_CACHE_MAX:
+                self._aliases.popitem(last=False)
+        return row
 
     async def cleanup_expired(self):
-        db = await get_db()
         threshold_seconds = TASK_MAX_AGE_HOURS * 3600
-        # SQLite datetime comparison
-        async with db.execute(
-            """SELECT task_id, repos FROM broker_tasks
-               WHERE (julianday('now') - julianday(registered_at)) * 86400 > ?""",
-            (threshold_seconds,),
-        ) as cur:
-            expired = await cur.fetchall()
-        for row in expired:
-            task_id = row["task_id"]
-            repos = json.loads(row["repos"])
-            log.info("Expiring stale task registration: %s", task_id)
-            await self._audit(db, "task_deregistered", task_id, repos)
-            await db.execute("DELETE FROM broker_tasks WHERE task_id = ?", (task_id,))
-        if expired:
-            await db.commit()
+
+        async def _expire(db):
+            # SQLite datetime comparison
+            async with db.execute(
+                """SELECT task_id, repos FROM broker_tasks
+                   WHERE (julianday('now') - julianday(registered_at)) * 86400 > ?""",
+                (threshold_seconds,),
+            ) as cur:
+                expired = await cur.fetchall()
+            for row in expired:
+                task_id = row["task_id"]
+                repos = json.loads(row["repos"])
+                log.info("Expiring stale task registration: %s", task_id)
+                await self._audit(db, "task_deregistered", task_id, repos)
+                await db.execute("DELETE FROM broker_tasks WHERE task_id = ?", (task_id,))
+
+        await run_write(_expire)
 
     async def _audit(self, db, action: str, task_id: str, repos: list[str]):
         now_iso = datetime.now(timezone.utc).isoformat()
@@ -237,17 +453,62 @@ class TokenBroker:
             "INSERT INTO token_audit (task_id, repos, action, created_at) VALUES (?, ?, ?, ?)",
             (task_id, json.dumps(repos), action, now_iso),
         )
-        # Trim old entries
-        await db.execute(
-            """DELETE FROM token_audit WHERE id NOT IN
-               (SELECT id FROM token_audit ORDER BY id DESC LIMIT ?)""",
-            (AUDIT_MAX_ENTRIES,),
-        )
+
+    async def compact_audit(self) -> int:
+        """Apply token_audit retention in small batches. Returns rows removed.
+
+        Ids and created_at both increase with insertion order, so expired
+        rows are always a prefix of the table by id.
+        """
+        async with read_db() as db:
+            async with db.execute(
+                "SELECT id FROM token_audit ORDER BY id DESC LIMIT 1 OFFSET ?",
+                (AUDIT_MAX_ENTRIES,),
+            ) as cur:
+                row = await cur.fetchone()
+        keep_after = row["id"] if row else 0
+        age_cutoff = None
+        if AUDIT_MAX_AGE_DAYS > 0:
+            age_cutoff = (datetime.now(timezone.utc) - timedelta(days=AUDIT_MAX_AGE_DAYS)).isoformat()
+
+        removed = 0
+        last_id = 0
+        while True:
+            async with read_db() as db:
+                async with db.execute(
+                    "SELECT * FROM token_audit WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, AUDIT_COMPACT_BATCH),
+                ) as cur:
+                    rows = await cur.fetchall()
+            batch = []
+            for row in rows:
+                if row["id"] > keep_after and not (age_cutoff and row["created_at"] < age_cutoff):
+                    break
+                batch.append(row)
+            if not batch:
+                break
+
+            if AUDIT_ARCHIVE_DIR:
+                await asyncio.to_thread(_archive_audit_rows, [dict(r) for r in batch])
+                self.audit_archived += len(batch)
+            first, last_id = batch[0]["id"], batch[-1]["id"]
+            await run_write(lambda db: db.execute(
+                "DELETE FROM token_audit WHERE id BETWEEN ? AND ?", (first, last_id),
+            ))
+            removed += len(batch)
+            if len(batch) < len(rows) or len(rows) < AUDIT_COMPACT_BATCH:
+                break
+
+        if removed:
+            self.audit_compacted += removed
+            log.info("Compacted token_audit: removed %d row(s)%s", removed,
+                     " (archived)" if AUDIT_ARCHIVE_DIR else "")
+        return removed
 
     async def get_tasks(self) -> dict:
-        db = await get_db()
-        async with db.execute("SELECT * FROM broker_tasks") as cur:
-            rows = await cur.fetchall()
+        async with read_db() as db:
+            async with db.execute("SELECT * FROM broker_tasks") as cur:
+                rows = await cur.fetchall()
         return {
             row["task_id"]: {
                 "repos": json.loads(row["repos"]),
@@ -260,18 +521,18 @@ class TokenBroker:
         }
 
     async def get_audit_log(self, task_id: str | None = None, limit: int = 200) -> list:
-        db = await get_db()
-        if task_id:
-            async with db.execute(
-                "SELECT * FROM token_audit WHERE task_id = ? ORDER BY id DESC LIMIT ?",
-                (task_id, limit),
-            ) as cur:
-                rows = await cur.fetchall()
-        else:
-            async with db.execute(
-                "SELECT * FROM token_audit ORDER BY id DESC LIMIT ?", (limit,)
-            ) as cur:
-                rows = await cur.fetchall()
+        async with read_db() as db:
+            if task_id:
+                async with db.execute(
+                    "SELECT * FROM token_audit WHERE task_id = ? ORDER BY id DESC LIMIT ?",
+                    (task_id, limit),
+                ) as cur:
+                    rows = await cur.fetchall()
+            else:
+                async with db.execute(
+                    "SELECT * FROM token_audit ORDER BY id DESC LIMIT ?", (limit,)
+                ) as cur:
+                    rows = await cur.fetchall()
         return [
             {
                 "timestamp": row["created_at"],
@@ -283,21 +544,46 @@ class TokenBroker:
         ]
 
     async def get_summary(self) -> dict:
-        db = await get_db()
-        async with db.execute(
-            "SELECT COUNT(*) as cnt FROM broker_tasks WHERE status = 'active'"
-        ) as cur:
-            active = (await cur.fetchone())["cnt"]
-        async with db.execute(
-            "SELECT COALESCE(SUM(token_count), 0) as total FROM broker_tasks"
-        ) as cur:
-            total_tokens = (await cur.fetchone())["total"]
-        async with db.execute("SELECT COUNT(*) as cnt FROM token_audit") as cur:
-            audit_count = (await cur.fetchone())["cnt"]
+        async with read_db() as db:
+            async with db.execute(
+                "SELECT COUNT(*) as cnt FROM broker_tasks WHERE status = 'active'"
+            ) as cur:
+                active = (await cur.fetchone())["cnt"]
+            async with db.execute(
+                "SELECT COALESCE(SUM(token_count), 0) as total FROM broker_tasks"
+            ) as cur:
+                total_tokens = (await cur.fetchone())["total"]
+            async with db.execute("SELECT COUNT(*) as cnt FROM token_audit") as cur:
+                audit_count = (await cur.fetchone())["cnt"]
         return {
             "enabled": self.enabled,
             "app_id": self.app_id or None,
             "active_tasks": active,
             "total_tokens_issued": total_tokens,
             "audit_entries": audit_count,
+            "token_cache": self.cache_stats(),
+            "alias_cache": {
+                "entries": len(self._aliases),
+                "hits": self.alias_hits,
+                "misses": self.alias_misses,
+            },
+            "audit_compacted": self.audit_compacted,
+            "audit_archived": self.audit_archived,
+            "latency": {phase: t.summary() for phase, t in self.latency.items()},
         }
+
+
+def _archive_audit_rows(rows: list[dict]):
+    """Append audit rows to monthly gzip'd JSONL files (runs in a thread).
+
+    Appending to a .gz adds a gzip member; gzip/zcat read them as one stream.
+    """
+    archive_dir = Path(AUDIT_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    by_month: dict[str, list[dict]] = {}
+    for row in rows:
+        by_month.setdefault(row["created_at"][:7], []).append(row)
+    for month, month_rows in by_month.items():
+        with gzip.open(archive_dir / f"token-audit-{month}.jsonl.gz", "at") as f:
+            for row in month_rows:
+                f.write(json.dumps(row) + "\n")
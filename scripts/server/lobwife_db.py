@@ -1,16 +1,28 @@
 """lobwife_db — SQLite database module for lobwife daemon.
 
-Manages the aiosqlite connection, schema initialization, and one-time
+Manages the aiosqlite connections, schema initialization, and one-time
 migration from JSON state files to SQLite.
+
+Reads go through a small pool of read-only WAL connections (read_db()).
+Writes are funnelled through a single writer coroutine (run_write()) that
+runs queued write jobs back-to-back and group-commits them, so a slow
+SELECT never blocks a PATCH and a burst of writes costs one fsync.
+Task events are further buffered (log_event()) and inserted in bulk every
+few milliseconds. Committed events are exposed as a change feed
+(read_changes()) that waiters can block on instead of polling.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 import aiosqlite
 
@@ -23,20 +35,516 @@ STATE_DIR = Path(
 DB_PATH = STATE_DIR / "lobmob.db"
 SCHEMA_PATH = Path(__file__).parent / "lobwife-schema.sql"
 
-CURRENT_SCHEMA_VERSION = 2
+CURRENT_SCHEMA_VERSION = 5
+
+# Indexes on columns added by migrations; applied after migrate_schema()
+# so they exist on both fresh and migrated databases
+MIGRATED_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tasks_schedule ON tasks(status, priority_rank, queued_at)",
+    # Broker task lookup by alias (TokenBroker._find_task_with_broker)
+    "CREATE INDEX IF NOT EXISTS idx_tasks_slug ON tasks(slug)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks(name)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to ON tasks(assigned_to)",
+)
+
+READ_POOL_SIZE = int(os.environ.get("LOBWIFE_DB_READERS", "4"))
+WRITE_BATCH_MAX = int(os.environ.get("LOBWIFE_DB_WRITE_BATCH", "64"))
+EVENT_FLUSH_MS = int(os.environ.get("LOBWIFE_EVENT_FLUSH_MS", "50"))
+EVENT_FLUSH_ROWS = int(os.environ.get("LOBWIFE_EVENT_FLUSH_ROWS", "200"))
+
+T = TypeVar("T")
+WriteFn = Callable[[aiosqlite.Connection], Awaitable[T]]
 
-# Module-level connection
+# Module-level connections: one writer, a pool of readers
 _db: Optional[aiosqlite.Connection] = None
+_readers: Optional["ReadPool"] = None
+_writer: Optional["DBWriter"] = None
+_events: Optional["EventBuffer"] = None
+_changes: Optional["ChangeFeed"] = None
+
+
+class ReadPool:
+    """Fixed-size pool of read-only WAL connections."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._conns: list[aiosqlite.Connection] = []
+        self.waiting = 0
+        self.acquired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def open(self):
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("PRAGMA query_only=ON")
+            self._conns.append(conn)
+            self._idle.put_nowait(conn)
+
+    async def close(self):
+        for conn in self._conns:
+            await conn.close()
+        self._conns.clear()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            conn = await self._idle.get()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "wait_avg_ms": round(self.wait_total / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+        }
+
+
+class DBWriter:
+    """Single writer coroutine that owns the read-write connection.
+
+    Write jobs are async callables taking the connection. Jobs queued while
+    a commit is in flight are run together in one transaction (each inside
+    its own SAVEPOINT, so a failing job is rolled back alone) and committed
+    once. Jobs must not call commit() themselves.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, batch_max: int = WRITE_BATCH_MAX):
+        self._conn = conn
+        self.batch_max = batch_max
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self.jobs = 0
+        self.failed = 0
+        self.batches = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.last_commit_ms = 0.0
+        # Optional async hook run on the connection after each commit
+        self.on_commit: WriteFn | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Drain queued jobs, then stop the writer."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, fn: WriteFn, *, transaction: bool = True) -> Any:
+        if self._task is None:
+            raise RuntimeError("Database writer not running")
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((fn, fut, transaction, time.monotonic()))
+        return await fut
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            job = await self._queue.get()
+            if job is None:
+                break
+            batch = [job]
+            while len(batch) < self.batch_max and not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            try:
+                await self._execute(batch)
+            except Exception:
+                log.exception("Database writer batch failed")
+
+    async def _execute(self, batch: list):
+        now = time.monotonic()
+        for _, _, _, queued_at in batch:
+            waited = now - queued_at
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        self.jobs += len(batch)
+
+        txn_jobs = [j for j in batch if j[2] and not j[1].cancelled()]
+        raw_jobs = [j for j in batch if not j[2] and not j[1].cancelled()]
+
+        if txn_jobs:
+            await self._execute_transaction(txn_jobs)
+
+        # Non-transactional jobs (PRAGMAs, maintenance) run after the commit
+        for fn, fut, _, _ in raw_jobs:
+            try:
+                result = await fn(self._conn)
+            except Exception as e:
+                self.failed += 1
+                if not fut.done():
+                    fut.set_exception(e)
+            else:
+                if not fut.done():
+                    fut.set_result(result)
+
+    async def _execute_transaction(self, jobs: list):
+        db = self._conn
+        outcomes = []
+        try:
+            await db.execute("BEGIN")
+            for fn, fut, _, _ in jobs:
+                await db.execute("SAVEPOINT write_job")
+                try:
+                    result = await fn(db)
+                except Exception as e:
+                    await db.execute("ROLLBACK TO write_job")
+                    await db.execute("RELEASE write_job")
+                    outcomes.append((fut, None, e))
+                else:
+                    await db.execute("RELEASE write_job")
+                    outcomes.append((fut, result, None))
+            start = time.monotonic()
+            await db.commit()
+            self.last_commit_ms = round((time.monotonic() - start) * 1000, 2)
+            self.batches += 1
+            if self.on_commit is not None:
+                try:
+                    await self.on_commit(db)
+                except Exception as e:
+                    log.warning("Post-commit hook failed: %s", e)
+        except Exception as e:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+            self.failed += len(jobs)
+            for _, fut, _, _ in jobs:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for fut, result, err in outcomes:
+            if fut.done():
+                continue
+            if err is not None:
+                self.failed += 1
+                fut.set_exception(err)
+            else:
+                fut.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "jobs": self.jobs,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round(self.jobs / self.batches, 2) if self.batches else 0.0,
+            "wait_avg_ms": round(self.wait_total / self.jobs * 1000, 2) if self.jobs else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+            "last_commit_ms": self.last_commit_ms,
+        }
+
+
+class EventBuffer:
+    """Buffers task_events rows and inserts them in one write job.
+
+    Flushes every EVENT_FLUSH_MS or once EVENT_FLUSH_ROWS rows are pending,
+    whichever comes first, at most EVENT_FLUSH_ROWS rows per write. A
+    producer that fills the buffer waits for that flush, so a burst is
+    written in bounded batches. Rows for unknown task ids are dropped at
+    flush time rather than failing the whole batch.
+    """
+
+    INSERT_SQL = """INSERT INTO task_events (task_id, event_type, detail, actor, created_at)
+                    SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM tasks WHERE id = ?)"""
+
+    def __init__(self, flush_ms: int = EVENT_FLUSH_MS, flush_rows: int = EVENT_FLUSH_ROWS):
+        self.flush_ms = flush_ms
+        self.flush_rows = flush_rows
+        self._rows: list[tuple] = []
+        self._waiters: list[asyncio.Future] = []
+        self._wake = asyncio.Event()
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._in_flight = False
+        self.buffered = 0
+        self.inserted = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.max_flush_rows = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush pending rows, then stop the flusher."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    @property
+    def pending(self) -> int:
+        """Rows not yet committed (buffered or in a flush in progress)."""
+        return len(self._rows) + (1 if self._in_flight else 0)
+
+    async def add(self, task_id: int, event_type: str, detail: str | None = None,
+                  actor: str | None = None, *, durable: bool = False,
+                  created_at: str | None = None):
+        """Buffer one event. With durable=True, wait until it is committed.
+
+        created_at ("YYYY-MM-DD HH:MM:SS", UTC) defaults to now.
+        """
+        if self._task is None:
+            raise RuntimeError("Event buffer not running")
+        if created_at is None:
+            created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._rows.append((task_id, event_type, detail, actor, created_at, task_id))
+        self.buffered += 1
+        if durable or len(self._rows) >= self.flush_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_ms / 1000, self._wake.set,
+            )
+
+    async def flush(self):
+        """Flush pending rows now and wait for the commit."""
+        if not self.pending:
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._wake.set()
+        await fut
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            await self._flush_pending()
+            if self._stopping and not self._rows:
+                break
+
+    async def _flush_pending(self):
+        rows, self._rows = self._rows[:self.flush_rows], self._rows[self.flush_rows:]
+        err = None
+        if rows:
+            self._in_flight = True
+            try:
+                cur = await run_write(lambda db: db.executemany(self.INSERT_SQL, rows))
+                inserted = cur.rowcount if cur.rowcount >= 0 else len(rows)
+                self.inserted += inserted
+                self.dropped += len(rows) - inserted
+                self.flushes += 1
+                self.max_flush_rows = max(self.max_flush_rows, len(rows))
+            except Exception as e:
+                log.warning("Failed to flush %d task event(s): %s", len(rows), e)
+                self.dropped += len(rows)
+                err = e
+            finally:
+                self._in_flight = False
+        if self._rows and err is None:
+            # More rows than one batch were pending; waiters are released
+            # once the buffer drains
+            self._wake.set()
+            return
+        waiters, self._waiters = self._waiters, []
+        for fut in waiters:
+            if fut.done():
+                continue
+            if err is not None:
+                fut.set_exception(err)
+            else:
+                fut.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._rows),
+            "buffered": self.buffered,
+            "inserted": self.inserted,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "avg_flush_rows": round(self.inserted / self.flushes, 2) if self.flushes else 0.0,
+            "max_flush_rows": self.max_flush_rows,
+        }
+
+
+class ChangeFeed:
+    """Tracks the committed task_events head and wakes waiters when it moves.
+
+    The writer calls refresh() after every commit. Since there is a single
+    writer and ids are AUTOINCREMENT, ids become visible in order, so a
+    consumer that has seen id N never misses a later row with a smaller id.
+    Idle waiters block on an asyncio.Event and cost no queries.
+    """
+
+    SELECT_SQL = """SELECT e.id, e.task_id, e.event_type, e.detail, e.actor, e.created_at,
+                           t.status AS task_status, t.type AS task_type
+                    FROM task_events e LEFT JOIN tasks t ON t.id = e.task_id
+                    WHERE e.id > ? ORDER BY e.id LIMIT ?"""
+
+    def __init__(self):
+        self.head = 0
+        self._moved = asyncio.Event()
+        self.waiting = 0
+        self.notifications = 0
+
+    async def refresh(self, db: aiosqlite.Connection):
+        async with db.execute("SELECT MAX(id) FROM task_events") as cur:
+            head = (await cur.fetchone())[0] or 0
+        if head > self.head:
+            self.head = head
+            self.notifications += 1
+            moved, self._moved = self._moved, asyncio.Event()
+            moved.set()
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """Wait up to timeout seconds for head > since. Returns whether it moved."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.waiting += 1
+        try:
+            while self.head <= since:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(self._moved.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return False
+            return True
+        finally:
+            self.waiting -= 1
+
+    def stats(self) -> dict:
+        return {
+            "head": self.head,
+            "waiting": self.waiting,
+            "notifications": self.notifications,
+        }
 
 
 async def get_db() -> aiosqlite.Connection:
+    """Return the read-write connection.
+
+    Only for startup and one-off maintenance; request paths should use
+    read_db() and run_write() instead.
+    """
     if _db is None:
         raise RuntimeError("Database not initialized — call init_db() first")
     return _db
 
 
+@asynccontextmanager
+async def read_db() -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a read-only connection from the pool."""
+    if _readers is None:
+        raise RuntimeError("Database not initialized — call init_db() first")
+    async with _readers.acquire() as conn:
+        yield conn
+
+
+async def run_write(fn: WriteFn, *, transaction: bool = True) -> Any:
+    """Run a write job on the writer connection and wait for its commit.
+
+    fn receives the connection and must not commit. Returns fn's result,
+    or raises whatever fn raised (its changes are rolled back).
+    Pass transaction=False for statements that can't run inside a
+    transaction (e.g. PRAGMA wal_checkpoint).
+    """
+    if _writer is None:
+        raise RuntimeError("Database not initialized — call init_db() first")
+    return await _writer.submit(fn, transaction=transaction)
+
+
+async def log_event(task_id: int, event_type: str, detail: str | None = None,
+                    actor: str | None = None, *, durable: bool = False,
+                    created_at: str | None = None):
+    """Append a task event via the event buffer.
+
+    Returns once buffered; pass durable=True to wait for the commit
+    (read-your-write). created_at overrides the event time, e.g. for
+    events a client queued while lobwife was unreachable.
+    """
+    if _events is None:
+        raise RuntimeError("Database not initialized — call init_db() first")
+    await _events.add(task_id, event_type, detail, actor, durable=durable, created_at=created_at)
+
+
+async def flush_events():
+    """Commit any buffered task events before reading task_events."""
+    if _events is not None:
+        await _events.flush()
+
+
+def changes_head() -> int:
+    """Id of the newest committed task event (0 if none)."""
+    if _changes is None:
+        raise RuntimeError("Database not initialized — call init_db() first")
+    return _changes.head
+
+
+async def read_changes(since: int, *, limit: int = 500, timeout: float = 0.0) -> list[dict]:
+    """Committed task events with id > since, oldest first.
+
+    Each row carries the task's current status/type. With timeout > 0,
+    blocks up to that many seconds for new events when none are available.
+    """
+    feed = _changes
+    if feed is None:
+        raise RuntimeError("Database not initialized — call init_db() first")
+    if timeout > 0:
+        await feed.wait(since, timeout)
+    if feed.head <= since:
+        return []
+    async with read_db() as db:
+        async with db.execute(feed.SELECT_SQL, (since, limit)) as cur:
+            return [dict(r) for r in await cur.fetchall()]
+
+
+async def task_counts(db: aiosqlite.Connection) -> dict[str, dict[str, int]]:
+    """Task counts by dimension ("status", "type", "priority") from task_counts."""
+    counts: dict[str, dict[str, int]] = {"status": {}, "type": {}, "priority": {}}
+    async with db.execute(
+        "SELECT dimension, value, count FROM task_counts WHERE count > 0"
+    ) as cur:
+        for row in await cur.fetchall():
+            counts.setdefault(row["dimension"], {})[row["value"]] = row["count"]
+    return counts
+
+
+def db_stats() -> dict:
+    """Connection pool, writer queue, event buffer and change feed statistics for /health."""
+    return {
+        "readers": _readers.stats() if _readers else None,
+        "writer": _writer.stats() if _writer else None,
+        "events": _events.stats() if _events else None,
+        "changes": _changes.stats() if _changes else None,
+    }
+
+
 async def init_db() -> aiosqlite.Connection:
-    global _db
+    global _db, _readers, _writer, _events, _changes
     STATE_DIR.mkdir(parents=True, exist_ok=True)
 
     _db = await aiosqlite.connect(str(DB_PATH))
@@ -66,12 +574,33 @@ async def init_db() -> aiosqlite.Connection:
     # Run one-time migration from JSON files
     await migrate_json_to_db(_db)
 
-    log.info("Database initialized: %s", DB_PATH)
+    # Read pool + writer coroutine (schema must exist before readers open)
+    _readers = ReadPool(READ_POOL_SIZE)
+    await _readers.open()
+    _changes = ChangeFeed()
+    await _changes.refresh(_db)
+    _writer = DBWriter(_db)
+    _writer.on_commit = _changes.refresh
+    _writer.start()
+    _events = EventBuffer()
+    _events.start()
+
+    log.info("Database initialized: %s (%d readers)", DB_PATH, READ_POOL_SIZE)
     return _db
 
 
 async def close_db():
-    global _db
+    global _db, _readers, _writer, _events, _changes
+    if _events is not None:
+        await _events.stop()
+        _events = None
+    if _writer is not None:
+        await _writer.stop()
+        _writer = None
+    _changes = None
+    if _readers is not None:
+        await _readers.close()
+        _readers = None
     if _db is not None:
         await _db.close()
         _db = None
@@ -104,6 +633,53 @@ async def migrate_schema(db: aiosqlite.Connection):
         await db.commit()
         log.info("Schema migrated to v2")
 
+    if current < 3:
+        log.info("Migrating schema v2 → v3: backfilling task_counts")
+        await db.execute("DELETE FROM task_counts")
+        for dimension in ("status", "type", "priority"):
+            await db.execute(
+                f"""INSERT INTO task_counts (dimension, value, count)
+                    SELECT '{dimension}', {dimension}, COUNT(*) FROM tasks GROUP BY {dimension}"""
+            )
+        await db.execute(
+            "INSERT INTO schema_version (version) VALUES (?)", (3,)
+        )
+        await db.commit()
+        log.info("Schema migrated to v3")
+
+    if current < 4:
+        log.info("Migrating schema v3 → v4: adding claim lease to tasks")
+        try:
+            await db.execute("ALTER TABLE tasks ADD COLUMN lease_expires_at TEXT")
+        except Exception:
+            pass  # Column already exists (idempotent)
+        await db.execute(
+            "INSERT INTO schema_version (version) VALUES (?)", (4,)
+        )
+        await db.commit()
+        log.info("Schema migrated to v4")
+
+    if current < 5:
+        log.info("Migrating schema v4 → v5: adding priority_rank to tasks")
+        try:
+            await db.execute(
+                """ALTER TABLE tasks ADD COLUMN priority_rank INTEGER GENERATED ALWAYS AS (
+                       CASE priority WHEN 'critical' THEN 0 WHEN 'high' THEN 1
+                                     WHEN 'low' THEN 3 ELSE 2 END
+                   ) VIRTUAL"""
+            )
+        except Exception:
+            pass  # Column already exists (idempotent)
+        await db.execute(
+            "INSERT INTO schema_version (version) VALUES (?)", (5,)
+        )
+        await db.commit()
+        log.info("Schema migrated to v5")
+
+    for index_sql in MIGRATED_INDEXES:
+        await db.execute(index_sql)
+    await db.commit()
+
 
 async def migrate_json_to_db(db: aiosqlite.Connection):
     """One-time migration from JSON state files to SQLite.
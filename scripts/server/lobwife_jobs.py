@@ -15,7 +15,7 @@ from pathlib import Path
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from lobwife_db import get_db
+from lobwife_db import read_db, run_write
 
 log = logging.getLogger("lobwife")
 
@@ -58,30 +58,29 @@ class JobRunner:
 
     async def init_state(self):
         """Ensure all job definitions have a row in job_state."""
-        db = await get_db()
-        for name in JOB_DEFS:
-            await db.execute(
-                """INSERT OR IGNORE INTO job_state (name) VALUES (?)""",
-                (name,),
-            )
-        await db.commit()
+        async def _init(db):
+            for name in JOB_DEFS:
+                await db.execute(
+                    """INSERT OR IGNORE INTO job_state (name) VALUES (?)""",
+                    (name,),
+                )
+
+        await run_write(_init)
 
     async def _get_job_state(self, name: str) -> dict:
-        db = await get_db()
-        async with db.execute(
-            "SELECT * FROM job_state WHERE name = ?", (name,)
-        ) as cur:
-            row = await cur.fetchone()
-            if row is None:
-                return {}
-            return dict(row)
+        async with read_db() as db:
+            async with db.execute(
+                "SELECT * FROM job_state WHERE name = ?", (name,)
+            ) as cur:
+                row = await cur.fetchone()
+                if row is None:
+                    return {}
+                return dict(row)
 
     async def _update_job_state(self, name: str, **fields):
-        db = await get_db()
         sets = ", ".join(f"{k} = ?" for k in fields)
         vals = list(fields.values()) + [name]
-        await db.execute(f"UPDATE job_state SET {sets} WHERE name = ?", vals)
-        await db.commit()
+        await run_write(lambda db: db.execute(f"UPDATE job_state SET {sets} WHERE name = ?", vals))
 
     def _get_next_run(self, name: str) -> str | None:
         job = self.scheduler.get_job(name)
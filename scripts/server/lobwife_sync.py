@@ -3,21 +3,31 @@
 Periodically snapshots DB task state into vault files for Obsidian browsing.
 DB is the sole source of truth for task state; vault gets periodic updates.
 
+Change detection follows task_events: every task write logs an event in
+the same transaction, so the tasks touched since the last sync are the
+task_ids of events after a cursor (the last synced task_events.id). The
+cursor is persisted in sync_state, so restarts resume incrementally; a
+full resync only happens on first start or when requested.
+
 Runs as a background asyncio task inside lobwife-daemon.py alongside persist_loop.
 """
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import math
 import os
 import re
+import time
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 
 import yaml
 
-from lobwife_db import get_db
+from lobwife_db import read_db, run_write, task_counts
 
 log = logging.getLogger("lobwife.sync")
 
@@ -25,8 +35,18 @@ VAULT_PATH = os.environ.get("VAULT_PATH", "/home/lobwife/vault")
 TASKS_DIR = "010-tasks"
 OVERVIEW_FILE = f"{TASKS_DIR}/_overview.md"
 SYNC_INTERVAL = int(os.environ.get("VAULT_SYNC_INTERVAL", "300"))  # 5 min default
+CURSOR_NAME = "vault"
+# Event-triggered syncs wait for SYNC_DEBOUNCE seconds of quiet so a burst
+# of PATCHes becomes one cycle, but never delay the first request by more
+# than SYNC_MAX_DELAY; cycles start at least SYNC_MIN_INTERVAL apart
+SYNC_DEBOUNCE = float(os.environ.get("VAULT_SYNC_DEBOUNCE", "5"))
+SYNC_MAX_DELAY = float(os.environ.get("VAULT_SYNC_MAX_DELAY", "60"))
+SYNC_MIN_INTERVAL = float(os.environ.get("VAULT_SYNC_MIN_INTERVAL", "30"))
+LATENCY_SAMPLES = 200
 
 FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+# Overview lines that change on every write, ignored when comparing
+SYNCED_AT_RE = re.compile(r"^(synced_at: .*|\*\*Last synced:\*\* .*)$", re.MULTILINE)
 
 # Status -> subdirectory mapping for vault task files
 STATUS_DIR_MAP = {
@@ -37,19 +57,23 @@ STATUS_DIR_MAP = {
     "failed": "failed",
     "cancelled": "failed",
 }
+TASK_SUBDIRS = ("active", "completed", "failed")
 
 
 # ── Git helpers ──────────────────────────────────────────────────────
 
-async def _git(*args: str) -> str:
+async def _git(*args: str, stdin: str | None = None) -> str:
     """Run a git command in the vault directory. Returns stdout."""
     cmd = ["git", "-C", VAULT_PATH, *args]
     proc = await asyncio.create_subprocess_exec(
         *cmd,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
+    stdout, stderr = await asyncio.wait_for(
+        proc.communicate(stdin.encode() if stdin is not None else None), timeout=30,
+    )
     if proc.returncode != 0:
         err = stderr.decode().strip()
         raise RuntimeError(f"git {' '.join(args)} failed: {err}")
@@ -68,23 +92,42 @@ async def _pull_vault() -> None:
         await _git("pull", "origin", "main")
 
 
-async def _commit_and_push(message: str, files: list[str]) -> bool:
-    """Stage files, commit, and push. Returns True if a commit was made."""
-    if not files:
-        return False
-
-    for f in files:
-        await _git("add", f)
-
-    # Check if there's anything to commit
+async def _remote_moved() -> bool:
+    """True unless origin's main still points where our tracking ref does."""
+    remote = (await _git("ls-remote", "origin", "refs/heads/main")).split()
     try:
-        await _git("diff", "--cached", "--quiet")
-        # No changes staged
-        return False
+        tracked = await _git("rev-parse", "--verify", "-q", "refs/remotes/origin/main")
     except RuntimeError:
-        pass  # Changes exist — proceed
+        return True
+    return not remote or remote[0] != tracked
+
+
+async def _pull_and_reindex() -> None:
+    """Pull, then re-index the task files the pull added, changed or removed."""
+    if not await _remote_moved():
+        _stats["pulls_skipped"] += 1
+        return
+    before = await _git("rev-parse", "HEAD")
+    await _pull_vault()
+    after = await _git("rev-parse", "HEAD")
+    if before == after or not _index.built:
+        return
+    changed = await _git("diff", "--name-only", "--no-renames", before, after, "--", TASKS_DIR)
+    for rel_path in changed.splitlines():
+        if rel_path.endswith(".md"):
+            _index.index_file(Path(VAULT_PATH) / rel_path)
+
+
+async def _ahead_of_origin() -> bool:
+    """True if HEAD has commits origin/main doesn't (e.g. a failed push)."""
+    try:
+        return int(await _git("rev-list", "--count", "origin/main..HEAD")) > 0
+    except (RuntimeError, ValueError):
+        return False
 
-    await _git("commit", "-m", message)
+
+async def _push() -> None:
+    started = time.monotonic()
     try:
         await _git("push", "origin", "main")
     except RuntimeError:
@@ -92,7 +135,39 @@ async def _commit_and_push(message: str, files: list[str]) -> bool:
         log.warning("Sync push conflict, pulling and retrying")
         await _pull_vault()
         await _git("push", "origin", "main")
+    _push_latency.append(round((time.monotonic() - started) * 1000, 1))
+
 
+async def _commit_and_push(message: str, files: list[str]) -> bool:
+    """Stage files, commit, and push. Returns True if a commit was made.
+
+    With nothing new to commit, still pushes any earlier commit whose
+    push failed.
+    """
+    if not files:
+        return False
+
+    # One index update for every path: adds new/modified files and drops
+    # paths that no longer exist (the old side of a move); unknown paths
+    # that were never tracked are ignored
+    await _git("update-index", "--add", "--remove", "-z", "--stdin",
+               stdin="".join(f"{f}\0" for f in dict.fromkeys(files)))
+
+    # Check if there's anything to commit
+    try:
+        await _git("diff", "--cached", "--quiet")
+        staged = False
+    except RuntimeError:
+        staged = True  # Changes exist — proceed
+
+    if not staged:
+        if await _ahead_of_origin():
+            log.info("Pushing unpushed vault sync commit(s)")
+            await _push()
+        return False
+
+    await _git("commit", "-m", message)
+    await _push()
     return True
 
 
@@ -116,13 +191,112 @@ def _serialize_task_file(metadata: dict, body: str) -> str:
 
 def _find_task_file(task_id: str) -> Path | None:
     """Find existing vault file for a task across all subdirs."""
-    for subdir in ("active", "completed", "failed"):
+    for subdir in TASK_SUBDIRS:
         path = Path(VAULT_PATH) / TASKS_DIR / subdir / f"{task_id}.md"
         if path.exists():
             return path
     return None
 
 
+# ── Vault file index ─────────────────────────────────────────────────
+
+def _fm_hash(fm: dict) -> str:
+    return hashlib.sha1(json.dumps(fm, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class VaultIndex:
+    """In-memory map of task key (T-id or slug) -> (path, frontmatter hash).
+
+    The hash covers the DB-managed frontmatter last written (or, for files
+    indexed from disk, found) in the file, so a task whose DB state hasn't
+    changed is skipped without touching disk. Built on the first sync (and
+    rebuilt for each full resync), kept current by sync writes and by
+    re-indexing the files each pull changes.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[Path, str]] = {}
+        self._keys_by_path: dict[Path, set[str]] = {}
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._keys_by_path)
+
+    def get(self, key: str) -> tuple[Path, str] | None:
+        return self._entries.get(key)
+
+    def record(self, keys: list[str], path: Path, fm_hash: str) -> None:
+        for key in keys:
+            old = self._entries.get(key)
+            if old and old[0] != path:
+                self._keys_by_path.get(old[0], set()).discard(key)
+            self._entries[key] = (path, fm_hash)
+            self._keys_by_path.setdefault(path, set()).add(key)
+
+    def drop_path(self, path: Path) -> None:
+        for key in self._keys_by_path.pop(path, set()):
+            if self._entries.get(key, (None,))[0] == path:
+                del self._entries[key]
+
+    def index_file(self, path: Path) -> None:
+        """(Re)index one task file from disk, or forget it if it's gone."""
+        self.drop_path(path)
+        try:
+            fm, _ = _parse_frontmatter(path.read_text())
+        except (OSError, yaml.YAMLError):
+            return
+        keys = [path.stem] + [str(fm[k]) for k in ("id", "slug") if fm.get(k)]
+        self.record(keys, path, _fm_hash({k: fm[k] for k in DB_FRONTMATTER_KEYS if k in fm}))
+
+    def build(self) -> None:
+        """(Re)scan all task files from scratch (blocking; run in a thread)."""
+        started = time.monotonic()
+        self._entries.clear()
+        self._keys_by_path.clear()
+        for subdir in TASK_SUBDIRS:
+            for path in (Path(VAULT_PATH) / TASKS_DIR / subdir).glob("*.md"):
+                self.index_file(path)
+        self.built = True
+        log.info("Vault index built: %d task file(s) in %.1fs", len(self), time.monotonic() - started)
+
+
+_index = VaultIndex()
+
+# Paths written by a cycle whose commit failed; the files on disk already
+# match the DB, so later cycles would otherwise never stage them
+_unstaged: set[str] = set()
+
+# Cycle metrics, reported by sync_stats()
+_stats = {"cycles": 0, "skipped": 0, "failed": 0, "commits": 0, "tasks": 0, "pulls_skipped": 0}
+_tasks_per_cycle: deque[int] = deque(maxlen=LATENCY_SAMPLES)
+_push_latency: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+
+def _pct(samples, p: float) -> float | None:
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def sync_stats() -> dict:
+    """Cycle counters plus tasks-per-cycle and push latency (ms) percentiles."""
+    return {
+        **_stats,
+        "tasks_per_cycle": {
+            "p50": _pct(_tasks_per_cycle, 50),
+            "p95": _pct(_tasks_per_cycle, 95),
+            "max": _pct(_tasks_per_cycle, 100),
+        },
+        "push_latency": {
+            "count": len(_push_latency),
+            "p50_ms": _pct(_push_latency, 50),
+            "p95_ms": _pct(_push_latency, 95),
+            "max_ms": _pct(_push_latency, 100),
+        },
+    }
+
+
 # ── DB -> Frontmatter field mapping ─────────────────────────────────
 
 # Fields synced from DB to vault frontmatter
@@ -132,6 +306,9 @@ SYNC_FIELDS = {
     "workflow", "discord_thread_id",
 }
 
+# Every frontmatter key _db_row_to_frontmatter can emit
+DB_FRONTMATTER_KEYS = SYNC_FIELDS | {"id", "name", "created", "slug", "repos"}
+
 
 def _db_row_to_frontmatter(row: dict) -> dict:
     """Convert a DB task row to vault frontmatter fields."""
@@ -170,39 +347,86 @@ def _db_row_to_frontmatter(row: dict) -> dict:
 
 # ── Sync logic ───────────────────────────────────────────────────────
 
-async def _query_updated_tasks(since: str | None) -> list[dict]:
-    """Query DB for tasks updated since a given timestamp (or all if None)."""
-    db = await get_db()
-    if since:
-        query = """SELECT * FROM tasks WHERE updated_at > ? ORDER BY id"""
-        async with db.execute(query, (since,)) as cur:
-            rows = await cur.fetchall()
-    else:
-        query = """SELECT * FROM tasks ORDER BY id"""
-        async with db.execute(query) as cur:
-            rows = await cur.fetchall()
-    return [dict(r) for r in rows]
+async def load_cursor() -> int | None:
+    """Last task_events.id reflected in the vault (None = never synced)."""
+    async with read_db() as db:
+        async with db.execute(
+            "SELECT cursor FROM sync_state WHERE name = ?", (CURSOR_NAME,)
+        ) as cur:
+            row = await cur.fetchone()
+    return row["cursor"] if row else None
 
 
-async def _sync_task_file(row: dict) -> str | None:
-    """Sync a single task's DB state to its vault file.
+async def _save_cursor(cursor: int) -> None:
+    await run_write(lambda db: db.execute(
+        """INSERT INTO sync_state (name, cursor) VALUES (?, ?)
+           ON CONFLICT(name) DO UPDATE SET cursor = excluded.cursor,
+                                           updated_at = datetime('now')""",
+        (CURSOR_NAME, cursor),
+    ))
 
-    Returns the relative file path if changed, None if unchanged.
+
+async def _query_changed_tasks(cursor: int | None) -> tuple[list[dict], int]:
+    """Tasks with events after cursor (all tasks if None), plus the new cursor.
+
+    Both reads share one snapshot, so a task written after it is picked up
+    by the next cycle rather than skipped.
     """
+    async with read_db() as db:
+        await db.execute("BEGIN")
+        try:
+            async with db.execute("SELECT COALESCE(MAX(id), 0) FROM task_events") as cur:
+                head = (await cur.fetchone())[0]
+            if cursor is None:
+                query, params = "SELECT * FROM tasks ORDER BY id", ()
+            else:
+                query = """SELECT * FROM tasks WHERE id IN (
+                               SELECT DISTINCT task_id FROM task_events WHERE id > ? AND id <= ?
+                           ) ORDER BY id"""
+                params = (cursor, head)
+            async with db.execute(query, params) as cur:
+                rows = await cur.fetchall()
+        finally:
+            await db.execute("COMMIT")
+    return [dict(r) for r in rows], head
+
+
+def _task_target(row: dict) -> tuple[str, str | None, Path, dict, str]:
+    """(task id, slug, vault path, frontmatter, frontmatter hash) for a DB row."""
     task_id = f"T{row['id']}"
-    status = row.get("status", "queued")
-    target_subdir = STATUS_DIR_MAP.get(status, "active")
+    target_subdir = STATUS_DIR_MAP.get(row.get("status", "queued"), "active")
     target_path = Path(VAULT_PATH) / TASKS_DIR / target_subdir / f"{task_id}.md"
+    new_fm = _db_row_to_frontmatter(row)
+    return task_id, row.get("slug"), target_path, new_fm, _fm_hash(new_fm)
 
-    # Find existing file (may be in a different subdir)
-    existing = _find_task_file(task_id)
 
-    # Also check by slug for migrated tasks
-    slug = row.get("slug")
-    if not existing and slug:
-        existing = _find_task_file(slug)
+def _task_is_synced(row: dict) -> bool:
+    """True if the index says the task's vault file already matches the row."""
+    task_id, slug, target_path, _, fm_hash = _task_target(row)
+    entry = _index.get(task_id) or (_index.get(slug) if slug else None)
+    return entry == (target_path, fm_hash)
 
-    new_fm = _db_row_to_frontmatter(row)
+
+async def _sync_task_file(row: dict) -> list[str]:
+    """Sync a single task's DB state to its vault file.
+
+    Returns the relative paths to stage (the old path too when the file
+    moved between status directories), empty if unchanged.
+    """
+    task_id, slug, target_path, new_fm, fm_hash = _task_target(row)
+    keys = [task_id, slug] if slug else [task_id]
+    changed: list[str] = []
+
+    # Unchanged since it was last synced: skip without touching disk
+    entry = _index.get(task_id) or (_index.get(slug) if slug else None)
+    if entry and entry == (target_path, fm_hash):
+        return []
+
+    # Find existing file (may be in a different subdir; slug for migrated tasks)
+    if entry and entry[0].exists():
+        existing = entry[0]
+    else:
+        existing = _find_task_file(task_id) or (_find_task_file(slug) if slug else None)
 
     if existing:
         content = existing.read_text()
@@ -215,46 +439,41 @@ async def _sync_task_file(row: dict) -> str | None:
 
         # Check if anything actually changed
         if merged == old_fm and existing == target_path:
-            return None
+            _index.record(keys, target_path, fm_hash)
+            return []
 
-        # Move file if status changed subdirectory
+        # Move file if status changed subdirectory (staged with the rest)
         if existing != target_path:
             target_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                await _git("mv", str(existing), str(target_path))
-            except RuntimeError:
-                # git mv can fail if file is untracked; fall back to rename
-                existing.rename(target_path)
+            existing.rename(target_path)
+            changed.append(str(existing.relative_to(VAULT_PATH)))
 
         target_path.write_text(_serialize_task_file(merged, body.strip()))
+        if existing != target_path:
+            _index.drop_path(existing)
     else:
         # No vault file exists — create a minimal one
         target_path.parent.mkdir(parents=True, exist_ok=True)
         body = f"# {row.get('name', task_id)}\n\n_Task created via API. Content pending._"
         target_path.write_text(_serialize_task_file(new_fm, body))
 
-    return str(target_path.relative_to(VAULT_PATH))
-
+    _index.record(keys, target_path, fm_hash)
+    changed.append(str(target_path.relative_to(VAULT_PATH)))
+    return changed
 
-async def _write_overview() -> str:
-    """Write a task overview file with Dataview-queryable frontmatter.
 
-    Returns the relative file path.
-    """
-    db = await get_db()
-
-    # Count by status
-    async with db.execute(
-        "SELECT status, COUNT(*) as cnt FROM tasks GROUP BY status"
-    ) as cur:
-        status_counts = {r["status"]: r["cnt"] for r in await cur.fetchall()}
+async def _render_overview() -> str:
+    """Render the task overview file with Dataview-queryable frontmatter."""
+    async with read_db() as db:
+        # Count by status (trigger-maintained counters)
+        status_counts = (await task_counts(db))["status"]
 
-    # Recent tasks (last 20)
-    async with db.execute(
-        "SELECT id, name, type, status, assigned_to, created_at, completed_at "
-        "FROM tasks ORDER BY id DESC LIMIT 20"
-    ) as cur:
-        recent = [dict(r) for r in await cur.fetchall()]
+        # Recent tasks (last 20)
+        async with db.execute(
+            "SELECT id, name, type, status, assigned_to, created_at, completed_at "
+            "FROM tasks ORDER BY id DESC LIMIT 20"
+        ) as cur:
+            recent = [dict(r) for r in await cur.fetchall()]
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -297,52 +516,88 @@ async def _write_overview() -> str:
     lines.append("")
 
     body = "\n".join(lines)
+    return _serialize_task_file(overview_fm, body)
+
+
+def _overview_digest(content: str) -> str:
+    return hashlib.sha1(SYNCED_AT_RE.sub("", content).encode()).hexdigest()
+
+
+def _overview_changed(content: str) -> bool:
+    """True if the overview differs from the vault copy beyond its timestamp."""
+    try:
+        current = (Path(VAULT_PATH) / OVERVIEW_FILE).read_text()
+    except OSError:
+        return True
+    return _overview_digest(current) != _overview_digest(content)
+
+
+def _write_overview(content: str) -> str:
+    """Write the overview file. Returns the relative file path."""
     overview_path = Path(VAULT_PATH) / OVERVIEW_FILE
     overview_path.parent.mkdir(parents=True, exist_ok=True)
-    overview_path.write_text(_serialize_task_file(overview_fm, body))
-
+    overview_path.write_text(content)
     return OVERVIEW_FILE
 
 
-async def run_sync_cycle(last_sync: str | None) -> str:
-    """Run a single sync cycle. Returns the new last_sync timestamp.
+async def run_sync_cycle(cursor: int | None) -> int | None:
+    """Run a single sync cycle from a task_events cursor (None = full resync).
 
-    Uses SQLite datetime format (YYYY-MM-DD HH:MM:SS) for timestamps
-    to match the DB's datetime('now') output.
-    """
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    Returns the new cursor, persisted once the vault reflects it; on
+    failure the old cursor is returned so the changes are retried.
 
-    # Pull latest vault state
+    The cycle is skipped (no pull, no commit) when every changed task's
+    file is already current and the overview differs only in timestamp.
+    A full resync rebuilds the index from disk first, so files edited or
+    deleted outside the sync are compared as they are now and repaired.
+    """
+    if cursor is None or not _index.built:
+        await asyncio.to_thread(_index.build)
+
+    # Tasks with events since the cursor
+    tasks, head = await _query_changed_tasks(cursor)
+    if cursor is not None and not _unstaged:
+        if not tasks:
+            log.debug("No tasks changed since event %d", cursor)
+            changed = False
+        else:
+            changed = (not all(_task_is_synced(t) for t in tasks)
+                       or _overview_changed(await _render_overview()))
+        if not changed:
+            _stats["skipped"] += 1
+            if head != cursor:
+                await _save_cursor(head)
+            return head
+    _stats["cycles"] += 1
+
+    # Pull latest vault state (skipped if origin hasn't moved)
     try:
-        await _pull_vault()
+        await _pull_and_reindex()
     except RuntimeError as e:
         log.warning("Vault pull failed, skipping sync cycle: %s", e)
-        return last_sync  # Don't advance timestamp on failure
-
-    # Query tasks updated since last sync
-    tasks = await _query_updated_tasks(last_sync)
-    if not tasks and last_sync:
-        log.debug("No tasks updated since last sync")
-        return now
+        _stats["failed"] += 1
+        return cursor  # Don't advance cursor on failure
 
     # Sync each changed task
+    _stats["tasks"] += len(tasks)
+    _tasks_per_cycle.append(len(tasks))
     changed_files = []
     for task in tasks:
         try:
-            rel_path = await _sync_task_file(task)
-            if rel_path:
-                changed_files.append(rel_path)
+            changed_files.extend(await _sync_task_file(task))
         except Exception as e:
             log.warning("Failed to sync task T%s: %s", task.get("id"), e)
 
-    # Write overview file
+    # Write overview file, unless only its timestamp would change
     try:
-        overview_path = await _write_overview()
-        changed_files.append(overview_path)
+        overview = await _render_overview()
+        if changed_files or _overview_changed(overview):
+            changed_files.append(_write_overview(overview))
     except Exception as e:
         log.warning("Failed to write overview: %s", e)
 
     # Commit and push all changes in one go
+    changed_files.extend(sorted(_unstaged.difference(changed_files)))
     if changed_files:
         try:
             committed = await _commit_and_push(
@@ -350,13 +605,19 @@ async def run_sync_cycle(last_sync: str | None) -> str:
                 changed_files,
             )
             if committed:
+                _stats["commits"] += 1
                 log.info("Vault sync: committed %d file(s)", len(changed_files))
             else:
                 log.debug("Vault sync: no changes to commit")
+            _unstaged.clear()
         except RuntimeError as e:
             log.warning("Vault sync commit/push failed: %s", e)
+            _unstaged.update(changed_files)
+            _stats["failed"] += 1
+            return cursor
 
-    return now
+    await _save_cursor(head)
+    return head
 
 
 # ── Sync daemon loop ─────────────────────────────────────────────────
@@ -364,20 +625,81 @@ async def run_sync_cycle(last_sync: str | None) -> str:
 class VaultSyncDaemon:
     """Background task that syncs DB state to vault on a schedule.
 
-    Supports event-triggered sync: call request_sync() to trigger
-    an immediate sync on the next loop iteration.
+    Supports event-triggered sync: call request_sync() to trigger a sync
+    once requests have been quiet for SYNC_DEBOUNCE seconds (full=True
+    rewrites every task file instead of only those changed since the
+    cursor). Requests arriving before that sync are coalesced into it.
     """
 
     def __init__(self, broker=None):
         self._last_sync: str | None = None
+        self._cursor: int | None = None
+        self._full_resync = False
         self._sync_needed = asyncio.Event()
         self._running = False
         self._broker = broker
-
-    def request_sync(self):
-        """Signal that an immediate sync is needed (called from API handlers)."""
+        # Monotonic times of the first and latest pending request, and of
+        # the last cycle start
+        self._first_request: float | None = None
+        self._last_request = 0.0
+        self._last_cycle = 0.0
+        self._pending = 0
+        self.requests = 0
+        self.coalesced = 0
+
+    def request_sync(self, full: bool = False):
+        """Signal that a sync is needed (called from API handlers)."""
+        if full:
+            self._full_resync = True
+        now = time.monotonic()
+        self.requests += 1
+        self._pending += 1
+        if self._first_request is None:
+            self._first_request = now
+        else:
+            self.coalesced += 1
+        self._last_request = now
         self._sync_needed.set()
 
+    def _due_at(self) -> float:
+        """When the pending request should be served (monotonic time)."""
+        due = min(self._last_request + SYNC_DEBOUNCE, self._first_request + SYNC_MAX_DELAY)
+        return max(due, self._last_cycle + SYNC_MIN_INTERVAL)
+
+    async def _debounce(self):
+        """Wait out the debounce window, extending it on each new request."""
+        while self._running and self._first_request is not None:
+            delay = self._due_at() - time.monotonic()
+            if delay <= 0:
+                return
+            self._sync_needed.clear()
+            try:
+                await asyncio.wait_for(self._sync_needed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            **sync_stats(),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "pending_since_s": round(time.monotonic() - self._first_request, 1)
+            if self._first_request is not None else None,
+        }
+
+    async def _sync(self):
+        cursor = None if self._full_resync else self._cursor
+        self._full_resync = False
+        # Requests from here on are served by the next cycle
+        self._first_request = None
+        self._pending = 0
+        self._last_cycle = time.monotonic()
+        new_cursor = await run_sync_cycle(cursor)
+        if new_cursor != cursor or cursor is None:
+            self._last_sync = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if new_cursor is not None:
+            self._cursor = new_cursor
+
     async def run(self):
         """Main loop: sync every SYNC_INTERVAL seconds, or immediately on event."""
         self._running = True
@@ -405,10 +727,12 @@ class VaultSyncDaemon:
         # Refresh vault remote URL with a fresh token before first sync
         await self._refresh_vault_credentials()
 
-        # Initial sync on startup (full scan)
+        # Initial sync on startup: resume from the persisted cursor, or a
+        # full scan if the vault has never been synced
         try:
-            self._last_sync = await run_sync_cycle(None)
-            log.info("Initial vault sync complete")
+            self._cursor = await load_cursor()
+            await self._sync()
+            log.info("Initial vault sync complete (cursor=%s)", self._cursor)
         except Exception:
             log.exception("Initial vault sync failed")
 
@@ -420,15 +744,18 @@ class VaultSyncDaemon:
                         self._sync_needed.wait(),
                         timeout=SYNC_INTERVAL,
                     )
-                    # Event triggered — clear it
+                    # Event triggered — let the burst settle first
+                    await self._debounce()
                     self._sync_needed.clear()
-                    log.info("Event-triggered vault sync")
+                    if not self._running:
+                        break
+                    log.info("Event-triggered vault sync (%d request(s))", self._pending)
                 except asyncio.TimeoutError:
                     # Normal interval sync
                     pass
 
                 await self._refresh_vault_credentials()
-                self._last_sync = await run_sync_cycle(self._last_sync)
+                await self._sync()
 
             except Exception:
                 log.exception("Vault sync cycle failed")
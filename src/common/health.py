@@ -5,8 +5,6 @@ import logging
 import time
 from typing import Any
 
-import anthropic
-
 logger = logging.getLogger("lobboss.health")
 
 CIRCUIT_BREAKER_THRESHOLD = 3
@@ -16,9 +14,15 @@ CIRCUIT_BREAKER_COOLDOWN = 300  # seconds
 class CircuitBreaker:
     """Tracks consecutive failures for a dependency. Opens after threshold."""
 
-    def __init__(self, name: str, threshold: int = CIRCUIT_BREAKER_THRESHOLD) -> None:
+    def __init__(
+        self,
+        name: str,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+    ) -> None:
         self.name = name
         self.threshold = threshold
+        self.cooldown = cooldown
         self.failures = 0
         self.open_until = 0.0
 
@@ -39,10 +43,10 @@ class CircuitBreaker:
     def record_failure(self) -> None:
         self.failures += 1
         if self.failures >= self.threshold:
-            self.open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN
+            self.open_until = time.monotonic() + self.cooldown
             logger.error(
                 "Circuit breaker %s: OPEN after %d failures (cooldown %ds)",
-                self.name, self.failures, CIRCUIT_BREAKER_COOLDOWN,
+                self.name, self.failures, self.cooldown,
             )
 
 
@@ -64,6 +68,8 @@ class HealthChecker:
         if breaker.is_open:
             return False
         try:
+            import anthropic
+
             client = anthropic.AsyncAnthropic(api_key=self._api_key)
             await client.messages.count_tokens(
                 model="claude-haiku-4-5",
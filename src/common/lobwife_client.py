@@ -1,7 +1,9 @@
 """lobwife_client — async HTTP client for the lobwife API.
 
 Shared by lobboss (via mcp_tools), lobsters (via run_task), and
-Python cron scripts (task-manager, status-reporter).
+Python cron scripts (task-manager, status-reporter). Calls reuse one
+keep-alive session per process unless a session is passed explicitly;
+long-running callers should await close_session() on shutdown.
 """
 
 from __future__ import annotations
@@ -9,18 +11,93 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from typing import Any, Optional
+import random
+import re
+from collections import defaultdict
+from typing import Any, AsyncIterator, Optional
 
 import aiohttp
 
+from common.health import CircuitBreaker
+
 log = logging.getLogger("common.lobwife_client")
 
 LOBWIFE_URL = os.environ.get(
     "LOBWIFE_URL", "http://lobwife.lobmob.svc.cluster.local:8081"
 )
 
-# Retry config: 3 attempts with backoff
-_RETRY_DELAYS = (2, 5, 10)
+# Retry config: up to 3 retries with full-jitter exponential backoff
+# (sleep uniform(0, min(cap, base * 2**attempt))) so clients don't retry
+# in lockstep when lobwife restarts
+_MAX_RETRIES = 3
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 10.0
+
+# Process-wide retry budget: each successful request earns a fraction of a
+# retry, each retry spends one. Caps retry traffic at ~20% of successes
+# once the initial allowance is used up.
+_RETRY_BUDGET_MAX = 10.0
+_RETRY_BUDGET_RATIO = 0.2
+
+# Fail fast while lobwife is down: open after consecutive failed requests
+_breaker = CircuitBreaker("lobwife", threshold=5, cooldown=30)
+
+# Shared keep-alive connection pool. The change-feed long-poll holds one
+# connection for its whole wait, so leave headroom above the request fan-out.
+_CONN_LIMIT = int(os.environ.get("LOBWIFE_CONN_LIMIT", "32"))
+_CONN_LIMIT_PER_HOST = int(os.environ.get("LOBWIFE_CONN_LIMIT_PER_HOST", "16"))
+_KEEPALIVE_TIMEOUT = 30
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class _RetryBudget:
+    """Token bucket shared by all requests in the process."""
+
+    def __init__(self, capacity: float = _RETRY_BUDGET_MAX, ratio: float = _RETRY_BUDGET_RATIO) -> None:
+        self.capacity = capacity
+        self.ratio = ratio
+        self.tokens = capacity
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.exhausted += 1
+        return False
+
+
+_retry_budget = _RetryBudget()
+
+# Per-endpoint counters, keyed by "METHOD /path/{id}"
+_endpoint_stats: dict[str, dict[str, int]] = defaultdict(
+    lambda: {"requests": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+)
+_ID_SEGMENT = re.compile(r"/\d+")
+
+
+def _endpoint(method: str, path: str) -> str:
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
+
+def client_stats() -> dict:
+    """Retry/breaker counters for health reporting."""
+    return {
+        "breaker_open": _breaker.is_open,
+        "consecutive_failures": _breaker.failures,
+        "retry_budget": round(_retry_budget.tokens, 2),
+        "retry_budget_exhausted": _retry_budget.exhausted,
+        "endpoints": {k: dict(v) for k, v in _endpoint_stats.items()},
+    }
 
 
 class LobwifeAPIError(Exception):
@@ -31,6 +108,34 @@ class LobwifeAPIError(Exception):
         super().__init__(f"lobwife API {status}: {message}")
 
 
+def get_session() -> aiohttp.ClientSession:
+    """Module-level session with a keep-alive connector, created on first use.
+
+    Sessions are bound to an event loop, so a new one is created if the
+    loop has changed (e.g. successive asyncio.run() calls in a script).
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=_CONN_LIMIT,
+            limit_per_host=_CONN_LIMIT_PER_HOST,
+            keepalive_timeout=_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session. Call on shutdown from the loop that used it."""
+    global _session, _session_loop
+    session, _session, _session_loop = _session, None, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
 async def _request(
     method: str,
     path: str,
@@ -38,38 +143,54 @@ async def _request(
     json: Optional[dict] = None,
     params: Optional[dict] = None,
     session: Optional[aiohttp.ClientSession] = None,
+    timeout: float = 15,
 ) -> Any:
-    """Make an HTTP request to the lobwife API with retry."""
+    """Make an HTTP request to the lobwife API with retry.
+
+    Raises RuntimeError without a network call while the circuit breaker
+    is open, and when connection errors outlast the retries or the
+    process-wide retry budget.
+    """
+    stats = _endpoint_stats[_endpoint(method, path)]
+    stats["requests"] += 1
+    if _breaker.is_open:
+        stats["short_circuited"] += 1
+        raise RuntimeError("lobwife API unavailable (circuit breaker open)")
+
     url = f"{LOBWIFE_URL}{path}"
-    own_session = session is None
-    if own_session:
-        session = aiohttp.ClientSession()
-
-    last_err = None
-    try:
-        for attempt, delay in enumerate((*_RETRY_DELAYS, None)):
-            try:
-                async with session.request(
-                    method, url, json=json, params=params,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as resp:
-                    body = await resp.json()
-                    if resp.status >= 400:
-                        msg = body.get("error", str(body)) if isinstance(body, dict) else str(body)
-                        raise LobwifeAPIError(resp.status, msg)
-                    return body
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                last_err = e
-                if delay is not None:
-                    log.warning(
-                        "lobwife API %s %s failed (attempt %d): %s, retrying in %ds",
-                        method, path, attempt + 1, e, delay,
-                    )
-                    await asyncio.sleep(delay)
-        raise RuntimeError(f"lobwife API unreachable after {len(_RETRY_DELAYS)} retries: {last_err}")
-    finally:
-        if own_session:
-            await session.close()
+    if session is None:
+        session = get_session()
+
+    attempt = 0
+    while True:
+        try:
+            async with session.request(
+                method, url, json=json, params=params,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                body = await resp.json()
+            # Any response means lobwife is up, even an error status
+            _breaker.record_success()
+            _retry_budget.deposit()
+            if resp.status >= 400:
+                msg = body.get("error", str(body)) if isinstance(body, dict) else str(body)
+                raise LobwifeAPIError(resp.status, msg)
+            return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt >= _MAX_RETRIES or _breaker.is_open or not _retry_budget.withdraw():
+                stats["failures"] += 1
+                _breaker.record_failure()
+                raise RuntimeError(
+                    f"lobwife API unreachable after {attempt} retries: {e}"
+                ) from e
+            delay = _backoff(attempt)
+            attempt += 1
+            stats["retries"] += 1
+            log.warning(
+                "lobwife API %s %s failed (attempt %d): %s, retrying in %.1fs",
+                method, path, attempt, e, delay,
+            )
+            await asyncio.sleep(delay)
 
 
 async def create_task(
@@ -85,6 +206,18 @@ async def create_task(
     return await _request("POST", "/api/v1/tasks", json=payload, session=session)
 
 
+async def create_tasks(
+    tasks: list[dict],
+    *,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    """POST /api/v1/tasks:batch — create many tasks in one transaction.
+
+    Returns {created, failed, results: [{index, status, id, task_id | error}]}.
+    """
+    return await _request("POST", "/api/v1/tasks:batch", json={"tasks": tasks}, session=session)
+
+
 async def get_task(
     task_id: int,
     *,
@@ -99,17 +232,128 @@ async def list_tasks(
     status: Optional[str] = None,
     type: Optional[str] = None,
     limit: int = 100,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    updated_since: Optional[str] = None,
     session: Optional[aiohttp.ClientSession] = None,
 ) -> list:
-    """GET /api/v1/tasks — list tasks with optional filters."""
+    """GET /api/v1/tasks — list tasks with optional filters.
+
+    after_id returns tasks with a larger id in ascending order; before_id
+    returns smaller ids in descending order. fields limits the columns
+    returned (id/task_id are always present).
+    """
     params = {"limit": str(limit)}
     if status:
         params["status"] = status
     if type:
         params["type"] = type
+    if after_id is not None:
+        params["after_id"] = str(after_id)
+    if before_id is not None:
+        params["before_id"] = str(before_id)
+    if fields:
+        params["fields"] = ",".join(fields)
+    if updated_since:
+        params["updated_since"] = updated_since
     return await _request("GET", "/api/v1/tasks", params=params, session=session)
 
 
+async def iter_tasks(
+    *,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    updated_since: Optional[str] = None,
+    page_size: int = 500,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> AsyncIterator[dict]:
+    """Yield every matching task in ascending id order, one page at a time."""
+    after_id = 0
+    while True:
+        page = await list_tasks(
+            status=status, type=type, limit=page_size, after_id=after_id,
+            fields=fields, updated_since=updated_since, session=session,
+        )
+        for task in page:
+            yield task
+        if len(page) < page_size:
+            return
+        after_id = page[-1]["id"]
+
+
+async def claim_tasks(
+    claimant: str,
+    *,
+    limit: int = 1,
+    lease_seconds: int = 300,
+    types: Optional[list[str]] = None,
+    per_type: int = 0,
+    per_repo: int = 0,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> list:
+    """POST /api/v1/tasks/claim — atomically claim up to limit queued tasks.
+
+    Returns the claimed task rows (highest priority, oldest first). Confirm
+    each claim by PATCHing lease_expires_at=None, or release it by PATCHing
+    status="queued". per_type/per_repo cap concurrently active tasks per
+    type/repo (0 = no cap).
+    """
+    payload: dict[str, Any] = {
+        "claimant": claimant, "limit": limit, "lease_seconds": lease_seconds,
+        "per_type": per_type, "per_repo": per_repo,
+    }
+    if types:
+        payload["types"] = types
+    result = await _request("POST", "/api/v1/tasks/claim", json=payload, session=session)
+    return result["tasks"]
+
+
+async def next_tasks(
+    *,
+    limit: int = 10,
+    types: Optional[list[str]] = None,
+    per_type: int = 0,
+    per_repo: int = 0,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> list:
+    """GET /api/v1/tasks/next — preview the next runnable tasks (no claim)."""
+    params = {"limit": str(limit), "per_type": str(per_type), "per_repo": str(per_repo)}
+    if types:
+        params["types"] = ",".join(types)
+    return await _request("GET", "/api/v1/tasks/next", params=params, session=session)
+
+
+async def get_task_stats(
+    *,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    """GET /api/v1/tasks/stats — task counts and queue age percentiles."""
+    return await _request("GET", "/api/v1/tasks/stats", session=session)
+
+
+async def wait_for_changes(
+    since: Optional[int] = None,
+    *,
+    timeout: float = 30,
+    limit: int = 500,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    """GET /api/v1/changes — long-poll for task events after a cursor.
+
+    Returns {changes: [...], cursor} once events exist or after timeout
+    seconds. Pass the returned cursor as since on the next call; with
+    since=None only events committed after the call are returned.
+    """
+    params = {"timeout": str(timeout), "limit": str(limit)}
+    if since is not None:
+        params["since"] = str(since)
+    return await _request(
+        "GET", "/api/v1/changes", params=params, session=session, timeout=timeout + 15,
+    )
+
+
 async def update_task(
     task_id: int,
     *,
@@ -120,23 +364,56 @@ async def update_task(
     return await _request("PATCH", f"/api/v1/tasks/{task_id}", json=fields, session=session)
 
 
+async def update_tasks(
+    updates: list[dict],
+    *,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    """PATCH /api/v1/tasks:batch — update many tasks in one transaction.
+
+    Each update is {"id": <db id>, **fields}. Returns
+    {updated, failed, results: [{index, status, id, updated | error}]}.
+    """
+    return await _request("PATCH", "/api/v1/tasks:batch", json={"tasks": updates}, session=session)
+
+
 async def log_event(
     task_id: int,
     event_type: str,
     detail: Optional[str] = None,
     actor: Optional[str] = None,
     *,
+    buffered: bool = False,
     session: Optional[aiohttp.ClientSession] = None,
 ) -> dict:
-    """POST /api/v1/tasks/{id}/events — log a task event."""
+    """POST /api/v1/tasks/{id}/events — log a task event.
+
+    Events are group-committed server-side and committed before the
+    response; set buffered=True to return as soon as the event is queued.
+    """
     payload = {"event_type": event_type}
     if detail:
         payload["detail"] = detail
     if actor:
         payload["actor"] = actor
+    if buffered:
+        payload["buffered"] = True
     return await _request("POST", f"/api/v1/tasks/{task_id}/events", json=payload, session=session)
 
 
+async def log_events(
+    events: list[dict],
+    *,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> dict:
+    """POST /api/v1/events:batch — log many events, committed on return.
+
+    Each event is {task_id, event_type, detail?, actor?, created_at?}.
+    Returns {logged, failed, results: [{index, status, task_id | error}]}.
+    """
+    return await _request("POST", "/api/v1/events:batch", json={"events": events}, session=session)
+
+
 async def register_broker(
     task_id: int,
     repos: list[str],
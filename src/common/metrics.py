@@ -0,0 +1,53 @@
+"""Lightweight in-process metrics (no external exporter).
+
+Snapshots are plain dicts so they can be dropped into the health status
+JSON or logged.
+"""
+
+import bisect
+
+# Default latency buckets (seconds), upper bounds
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600)
+
+
+class Histogram:
+    """Fixed-bucket histogram. Percentiles are reported as bucket upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.count:
+            return None
+        target = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": round(self.sum / self.count, 3) if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": round(self.max, 3),
+            # Per-bucket (non-cumulative) counts keyed by upper bound
+            "buckets": {
+                **{f"{b:g}": n for b, n in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
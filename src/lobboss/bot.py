@@ -13,7 +13,7 @@ import discord
 
 from lobboss.agent import LobbossAgent
 from lobboss.config import Config
-from lobboss.mcp_tools import set_bot
+from lobboss.mcp_tools import NAMESPACE, _get_k8s_clients, set_bot
 
 logger = logging.getLogger("lobboss.bot")
 
@@ -41,11 +41,22 @@ class LobbossBot(discord.Client):
     async def setup_hook(self) -> None:
         """Called after login, before the bot starts receiving events."""
         await self._setup_git_auth()
+        self._start_k8s_informer()
         self.loop.create_task(self._process_queue())
         self.loop.create_task(self._write_health_status())
         if self.config.poller.enabled:
             self.loop.create_task(self._run_task_poller())
 
+    def _start_k8s_informer(self) -> None:
+        """Start the lobster Job/Pod watch cache (falls back to direct lists on failure)."""
+        from lobboss.k8s_cache import start_informer
+
+        try:
+            batch_api, core_api = _get_k8s_clients()
+            start_informer(batch_api, core_api, NAMESPACE)
+        except Exception as e:
+            logger.warning("Failed to start k8s informer, using direct API lists: %s", e)
+
     async def _setup_git_auth(self) -> None:
         """Configure git to use gh-lobwife wrapper for credentials."""
         try:
@@ -153,11 +164,19 @@ class LobbossBot(discord.Client):
             interval=self.config.poller.interval_seconds,
             max_concurrent=self.config.poller.max_concurrent_lobsters,
             bot=self,
+            event_driven=self.config.poller.event_driven,
+            per_type=self.config.poller.max_active_per_type,
+            per_repo=self.config.poller.max_active_per_repo,
+            spawn_concurrency=self.config.poller.spawn_concurrency,
         )
 
     async def _write_health_status(self) -> None:
         """Periodically write health status JSON for the web server to read."""
         from common.health import HealthChecker
+        from common.lobwife_client import client_stats
+        from lobboss.k8s_cache import informer_stats
+        from lobboss.mcp_tools import k8s
+        from lobboss.task_poller import poller_stats
 
         api_key = os.environ.get("ANTHROPIC_API_KEY", "")
         checker = HealthChecker(api_key=api_key, bot=self)
@@ -168,7 +187,15 @@ class LobbossBot(discord.Client):
         while True:
             try:
                 results = await checker.check_all()
-                data = {**results, "checked_at": asyncio.get_event_loop().time()}
+                data = {
+                    **results,
+                    "poller": poller_stats(),
+                    "k8s_informer": informer_stats(),
+                    "k8s_api": k8s.stats(),
+                    "lobwife_client": client_stats(),
+                    "discord_latency_ms": round(self.latency * 1000, 1),
+                    "checked_at": asyncio.get_event_loop().time(),
+                }
                 # Atomic write via tmp + rename
                 fd, tmp_path = tempfile.mkstemp(dir=health_dir, suffix=".json")
                 try:
@@ -184,7 +211,10 @@ class LobbossBot(discord.Client):
 
     async def close(self) -> None:
         """Shut down agent sessions, then disconnect."""
+        from common.lobwife_client import close_session
+
         await self._agent.close_all()
+        await close_session()
         await super().close()
 
 
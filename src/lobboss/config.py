@@ -59,6 +59,10 @@ class PollerConfig:
     enabled: bool = True
     interval_seconds: int = 60
     max_concurrent_lobsters: int = 5
+    event_driven: bool = True
+    max_active_per_type: int = 0  # fairness quotas, 0 = no cap
+    max_active_per_repo: int = 0
+    spawn_concurrency: int = 8
 
     @classmethod
     def from_env(cls) -> "PollerConfig":
@@ -66,6 +70,10 @@ class PollerConfig:
             enabled=os.environ.get("TASK_POLLER_ENABLED", "true").lower() in ("true", "1", "yes"),
             interval_seconds=int(os.environ.get("TASK_POLL_INTERVAL", "60")),
             max_concurrent_lobsters=int(os.environ.get("MAX_CONCURRENT_LOBSTERS", "5")),
+            event_driven=os.environ.get("TASK_POLLER_EVENTS", "true").lower() in ("true", "1", "yes"),
+            max_active_per_type=int(os.environ.get("MAX_ACTIVE_PER_TYPE", "0")),
+            max_active_per_repo=int(os.environ.get("MAX_ACTIVE_PER_REPO", "0")),
+            spawn_concurrency=int(os.environ.get("SPAWN_CONCURRENCY", "8")),
         )
 
 
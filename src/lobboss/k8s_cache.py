@@ -0,0 +1,198 @@
+"""Informer cache of lobster Jobs and Pods.
+
+One list+watch stream per kind replaces the per-poll list_namespaced_job
+calls. The blocking kubernetes watches run on daemon threads; events are
+applied on the event loop, so reads (poller, lobster_status) are plain
+dict lookups with no API round-trip. Callers fall back to a direct list
+until the cache has synced.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("lobboss.k8s_cache")
+
+LOBSTER_SELECTOR = "app.kubernetes.io/name=lobster"
+TASK_LABEL = "lobmob.io/task-id"
+WATCH_TIMEOUT = 300  # seconds per watch request before it is re-issued
+WATCH_RETRY_DELAY = 5
+
+# Module-level informer, started from LobbossBot.setup_hook
+_informer: Optional["LobsterInformer"] = None
+
+
+def job_is_finished(job: Any) -> bool:
+    """True once a Job has succeeded or failed (backoff_limit=0)."""
+    status = job.status
+    return bool(status and ((status.succeeded or 0) > 0 or (status.failed or 0) > 0))
+
+
+class LobsterInformer:
+    """Watch-backed cache of lobster Jobs (by name and task-id) and Pods (by job)."""
+
+    def __init__(self, batch_api: Any, core_api: Any, namespace: str) -> None:
+        self._batch_api = batch_api
+        self._core_api = core_api
+        self.namespace = namespace
+        self.jobs: dict[str, Any] = {}
+        self.pods: dict[str, Any] = {}
+        self._jobs_by_task: dict[str, set[str]] = {}
+        self._pods_by_job: dict[str, set[str]] = {}
+        self._synced = {"job": False, "pod": False}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping = threading.Event()
+        self.events = 0
+        self.relists = 0
+        self.errors = 0
+        self.last_event_at = 0.0
+
+    @property
+    def synced(self) -> bool:
+        return all(self._synced.values())
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for kind, list_fn in (
+            ("job", self._batch_api.list_namespaced_job),
+            ("pod", self._core_api.list_namespaced_pod),
+        ):
+            threading.Thread(
+                target=self._watch_forever, args=(kind, list_fn),
+                name=f"lobster-{kind}-informer", daemon=True,
+            ).start()
+        logger.info("Lobster informer started (namespace=%s)", self.namespace)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    # ── Reads (event loop only) ──────────────────────────────────────
+
+    def active_job_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job_is_finished(job))
+
+    def jobs_for_task(self, task_label: str) -> list[Any]:
+        return [self.jobs[n] for n in self._jobs_by_task.get(task_label, ()) if n in self.jobs]
+
+    def pods_for_job(self, job_name: str) -> list[Any]:
+        return [self.pods[n] for n in self._pods_by_job.get(job_name, ()) if n in self.pods]
+
+    def observe_job(self, job: Any) -> None:
+        """Record a Job we just created, ahead of its watch event."""
+        self._apply("job", "ADDED", job)
+
+    def stats(self) -> dict:
+        return {
+            "synced": self.synced,
+            "jobs": len(self.jobs),
+            "active_jobs": self.active_job_count(),
+            "pods": len(self.pods),
+            "events": self.events,
+            "relists": self.relists,
+            "errors": self.errors,
+            "last_event_age_s": round(time.time() - self.last_event_at, 1) if self.last_event_at else None,
+        }
+
+    # ── Index maintenance (event loop only) ──────────────────────────
+
+    def _index(self, kind: str) -> tuple[dict, dict, Callable[[Any], Optional[str]]]:
+        if kind == "job":
+            return self.jobs, self._jobs_by_task, lambda o: (o.metadata.labels or {}).get(TASK_LABEL)
+        return self.pods, self._pods_by_job, lambda o: (o.metadata.labels or {}).get("job-name")
+
+    def _apply(self, kind: str, event_type: str, obj: Any) -> None:
+        store, index, key_fn = self._index(kind)
+        name = obj.metadata.name
+        key = key_fn(obj)
+        if event_type == "DELETED":
+            store.pop(name, None)
+            if key in index:
+                index[key].discard(name)
+                if not index[key]:
+                    del index[key]
+        else:
+            store[name] = obj
+            if key:
+                index.setdefault(key, set()).add(name)
+        self.events += 1
+        self.last_event_at = time.time()
+
+    def _replace(self, kind: str, items: list[Any]) -> None:
+        store, index, _ = self._index(kind)
+        store.clear()
+        index.clear()
+        for obj in items:
+            self._apply(kind, "ADDED", obj)
+        if not self._synced[kind]:
+            logger.info("Lobster informer synced %d %s(s)", len(items), kind)
+        self._synced[kind] = True
+
+    # ── Watch threads ────────────────────────────────────────────────
+
+    def _watch_forever(self, kind: str, list_fn: Callable) -> None:
+        from kubernetes import watch
+        from kubernetes.client.rest import ApiException
+
+        resource_version = None
+        while not self._stopping.is_set():
+            try:
+                if resource_version is None:
+                    listing = list_fn(namespace=self.namespace, label_selector=LOBSTER_SELECTOR)
+                    resource_version = listing.metadata.resource_version
+                    self._loop.call_soon_threadsafe(self._replace, kind, listing.items)
+                    self.relists += 1
+
+                w = watch.Watch()
+                for event in w.stream(
+                    list_fn,
+                    namespace=self.namespace,
+                    label_selector=LOBSTER_SELECTOR,
+                    resource_version=resource_version,
+                    timeout_seconds=WATCH_TIMEOUT,
+                    _request_timeout=WATCH_TIMEOUT + 30,
+                ):
+                    if self._stopping.is_set():
+                        w.stop()
+                        break
+                    if event["type"] == "ERROR":
+                        # Usually 410 Gone: our resourceVersion is too old
+                        resource_version = None
+                        break
+                    obj = event["object"]
+                    resource_version = obj.metadata.resource_version
+                    self._loop.call_soon_threadsafe(self._apply, kind, event["type"], obj)
+            except ApiException as e:
+                self.errors += 1
+                if e.status == 410:
+                    resource_version = None
+                    continue
+                logger.warning("Lobster %s watch failed (%s), retrying", kind, e.status)
+                self._stopping.wait(WATCH_RETRY_DELAY)
+            except Exception as e:
+                self.errors += 1
+                resource_version = None
+                logger.warning("Lobster %s watch error: %s, relisting", kind, e)
+                self._stopping.wait(WATCH_RETRY_DELAY)
+
+
+def start_informer(batch_api: Any, core_api: Any, namespace: str) -> LobsterInformer:
+    """Start the module-level informer (idempotent). Call from the event loop."""
+    global _informer
+    if _informer is None:
+        _informer = LobsterInformer(batch_api, core_api, namespace)
+        _informer.start()
+    return _informer
+
+
+def informer_stats() -> Optional[dict]:
+    """Informer statistics for the health status file (None if not started)."""
+    return _informer.stats() if _informer is not None else None
+
+
+def get_informer() -> Optional[LobsterInformer]:
+    """The informer if it has completed its initial list, else None."""
+    if _informer is not None and _informer.synced:
+        return _informer
+    return None
@@ -2,151 +2,366 @@
 
 Queries lobwife API for queued tasks (source of truth) and spawns k8s Jobs.
 DB is sole state authority; vault sync daemon handles Obsidian visibility.
+
+Poll cycles are triggered by the lobwife change feed (a task queued, or a
+task finishing and freeing capacity); the fixed interval is only a safety
+net for missed wakeups.
 """
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 
 from common.lobwife_client import (
-    list_tasks as api_list_tasks,
+    claim_tasks as api_claim_tasks,
     update_task as api_update_task,
     log_event as api_log_event,
     register_broker as api_register_broker,
+    wait_for_changes as api_wait_for_changes,
     LobwifeAPIError,
 )
+from common.metrics import Histogram
+from lobboss.k8s_cache import LOBSTER_SELECTOR, get_informer, job_is_finished
 from lobboss.mcp_tools import (
-    NAMESPACE, VAULT_REPO, _get_k8s_clients, _sanitize_k8s_name, _spawn_lobster_core,
+    VALID_LOBSTER_TYPES, VAULT_REPO, _sanitize_k8s_name, _spawn_lobster_core, k8s,
 )
 
 logger = logging.getLogger("lobboss.task_poller")
 
-PRIORITY_ORDER = {"critical": 0, "high": 1, "normal": 2, "low": 3}
+# Claims are confirmed (lease cleared) once the Job is created; an
+# unconfirmed claim becomes claimable again after the lease expires
+CLAIMANT = os.environ.get("HOSTNAME", "lobboss")
+CLAIM_LEASE_SECONDS = 300
+
+# A released task is held back from claims (queued with lease_expires_at in
+# the future) for an exponentially growing delay, so a task that keeps
+# failing to spawn is retried at a bounded rate
+RELEASE_BACKOFF_BASE = 30
+RELEASE_BACKOFF_MAX = 900
+# Release count per task id, LRU-bounded: tasks later cancelled or spawned
+# by another replica are never confirmed here and simply age out
+RELEASE_TRACK_MAX = 1024
+_release_counts: OrderedDict[int, int] = OrderedDict()
+
+# Task statuses whose events should trigger a poll: new work, or freed capacity.
+# Events the poller causes itself (claims, confirms, releases) never wake it.
+WAKE_STATUSES = {"queued", "completed", "failed", "cancelled"}
+POLLER_ACTORS = {"task_poller", CLAIMANT}
+WATCH_TIMEOUT = 30  # long-poll wait per request (seconds)
+WATCH_RETRY_DELAY = 5
+
+# Claimed tasks spawned in parallel per cycle
+SPAWN_CONCURRENCY = 8
+
+# Seconds from queued_at to spawn, per-task spawn time, what triggered
+# each poll cycle, and spawn throughput
+pickup_latency = Histogram()
+spawn_duration = Histogram()
+_cycle_triggers = {"event": 0, "interval": 0}
+_spawn_totals = {"spawned": 0, "failed": 0}
+_last_batch: dict = {}
+
+
+def poller_stats() -> dict:
+    """Poller metrics for the health status file."""
+    return {
+        "pickup_latency_seconds": pickup_latency.snapshot(),
+        "spawn_seconds": spawn_duration.snapshot(),
+        "cycles": dict(_cycle_triggers),
+        "spawns": dict(_spawn_totals),
+        "last_batch": dict(_last_batch),
+    }
+
+
+def _queued_seconds(task: dict) -> float | None:
+    """Seconds since the task's queued_at (UTC), or None if unparseable."""
+    queued_at = task.get("queued_at") or task.get("created_at")
+    if not queued_at:
+        return None
+    try:
+        ts = datetime.fromisoformat(queued_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - ts).total_seconds())
 
 
-def _count_active_lobster_jobs() -> int:
+async def _count_active_lobster_jobs() -> int:
     """Count k8s lobster Jobs that are still active (not succeeded/failed)."""
-    batch_api, _ = _get_k8s_clients()
-    jobs = batch_api.list_namespaced_job(
-        namespace=NAMESPACE,
-        label_selector="app.kubernetes.io/name=lobster",
-    )
-    return sum(
-        1 for j in jobs.items
-        if j.status and j.status.active and j.status.active > 0
-    )
+    informer = get_informer()
+    if informer:
+        return informer.active_job_count()
+    jobs = await k8s.list_jobs(LOBSTER_SELECTOR)
+    return sum(1 for j in jobs if not job_is_finished(j))
 
 
-def _job_exists_for_task(task_id: str) -> bool:
+async def _job_exists_for_task(task_id: str) -> bool:
     """Check if a k8s Job already exists for this task-id (any state)."""
-    batch_api, _ = _get_k8s_clients()
-    label = f"lobmob.io/task-id={_sanitize_k8s_name(task_id)}"
-    jobs = batch_api.list_namespaced_job(
-        namespace=NAMESPACE,
-        label_selector=label,
-    )
-    return len(jobs.items) > 0
+    task_label = _sanitize_k8s_name(task_id)
+    informer = get_informer()
+    if informer:
+        return bool(informer.jobs_for_task(task_label))
+    jobs = await k8s.list_jobs(f"lobmob.io/task-id={task_label}")
+    return len(jobs) > 0
 
 
-async def poll_and_spawn(vault_path: str, max_concurrent: int, bot=None) -> int:
-    """Single poll cycle. Returns number of tasks spawned."""
-    active_count = _count_active_lobster_jobs()
-    available = max_concurrent - active_count
-    if available <= 0:
-        logger.debug("At capacity (%d/%d active lobsters), skipping", active_count, max_concurrent)
-        return 0
+async def _confirm_claim(db_id: int, task_id: str, job_name: str) -> bool:
+    """Assign a claimed task to its Job and clear the claim lease."""
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    try:
+        await api_update_task(
+            db_id,
+            assigned_to=job_name,
+            assigned_at=now,
+            lease_expires_at=None,
+            actor="task_poller",
+        )
+        return True
+    except (LobwifeAPIError, RuntimeError) as e:
+        logger.error("Failed to confirm claim for %s: %s", task_id, e)
+        return False
+
 
-    # Query lobwife API for queued tasks (source of truth)
+async def _release_claim(db_id: int, task_id: str, reason: str) -> None:
+    """Return a claimed task to the queue, not claimable until its backoff ends.
+
+    Lease expiry is the fallback if the release itself fails.
+    """
+    failures = _release_counts[db_id] = _release_counts.pop(db_id, 0) + 1
+    if len(_release_counts) > RELEASE_TRACK_MAX:
+        _release_counts.popitem(last=False)
+    delay = min(RELEASE_BACKOFF_BASE * 2 ** (failures - 1), RELEASE_BACKOFF_MAX)
+    not_before = datetime.now(timezone.utc) + timedelta(seconds=delay)
     try:
-        queued = await api_list_tasks(status="queued")
+        await api_update_task(
+            db_id,
+            status="queued",
+            assigned_to=None,
+            assigned_at=None,
+            lease_expires_at=not_before.strftime("%Y-%m-%d %H:%M:%S"),
+            actor="task_poller",
+        )
+        await api_log_event(
+            db_id, "claim_released", f"{reason} (retry in {delay}s)", "task_poller",
+        )
     except (LobwifeAPIError, RuntimeError) as e:
-        logger.error("Failed to query lobwife API for queued tasks: %s", e)
-        return 0
+        logger.error("Failed to release claim for %s: %s", task_id, e)
 
-    # Filter out system tasks
-    queued = [t for t in queued if t.get("type") != "system"]
 
-    if not queued:
-        return 0
+async def _fail_claim(db_id: int, task_id: str, reason: str) -> None:
+    """Mark a claimed task failed; requeueing would never let it spawn."""
+    _release_counts.pop(db_id, None)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    try:
+        await api_update_task(
+            db_id,
+            status="failed",
+            assigned_to=None,
+            lease_expires_at=None,
+            completed_at=now,
+            actor="task_poller",
+        )
+        await api_log_event(db_id, "spawn_rejected", reason, "task_poller")
+    except (LobwifeAPIError, RuntimeError) as e:
+        logger.error("Failed to mark %s failed: %s", task_id, e)
 
-    # Sort: priority (critical first), then oldest first (by queued_at or id)
-    queued.sort(key=lambda t: (
-        PRIORITY_ORDER.get(t.get("priority", "normal"), 2),
-        t.get("queued_at", t.get("created_at", "")),
-    ))
 
-    logger.info("Found %d queued task(s), %d slot(s) available", len(queued), available)
+async def _spawn_claimed(task: dict, bot=None) -> bool:
+    """Register broker, create the Job, confirm the claim, notify. Returns True if spawned."""
+    db_id = task["id"]
+    task_id = task["task_id"]  # "T42"
+    lobster_type = task.get("type", "research")
+    workflow = task.get("workflow", "default")
 
-    spawned = 0
-    for task in queued[:available]:
-        db_id = task["id"]
-        task_id = task["task_id"]  # "T42"
-        lobster_type = task.get("type", "research")
-        workflow = task.get("workflow", "default")
+    # Only a reclaimed (expired) lease can have a Job already
+    if task.get("reclaimed") and await _job_exists_for_task(task_id):
+        logger.warning("Job already exists for reclaimed task %s, confirming claim", task_id)
+        await _confirm_claim(db_id, task_id, _sanitize_k8s_name(f"lobster-{lobster_type}-{task_id}"))
+        return False
 
-        if _job_exists_for_task(task_id):
-            logger.warning("Job already exists for task %s, skipping", task_id)
-            continue
+    # An unknown type can never spawn; fail it before touching the broker
+    if lobster_type not in VALID_LOBSTER_TYPES:
+        reason = f"Invalid lobster_type '{lobster_type}'. Must be one of: {', '.join(VALID_LOBSTER_TYPES)}"
+        logger.error("Rejecting task %s: %s", task_id, reason)
+        await _fail_claim(db_id, task_id, reason)
+        return False
+
+    # Register broker BEFORE spawning (vault-clone needs the token immediately)
+    try:
+        task_repos = [VAULT_REPO]
+        if task.get("repos"):
+            repos = task["repos"] if isinstance(task["repos"], list) else []
+            task_repos.extend(repos)
+        await api_register_broker(db_id, task_repos, lobster_type)
+        logger.info("Broker registered via API for %s (db_id=%d)", task_id, db_id)
+    except (LobwifeAPIError, RuntimeError) as e:
+        logger.error("Failed to register broker for %s: %s (skipping spawn)", task_id, e)
+        await _release_claim(db_id, task_id, f"broker registration failed: {e}")
+        return False
+
+    try:
+        job_name = await _spawn_lobster_core(task_id, lobster_type, workflow)
+    except ValueError as e:
+        logger.error("Rejecting task %s: %s", task_id, e)
+        await _fail_claim(db_id, task_id, str(e))
+        return False
+    except RuntimeError as e:
+        logger.error("Failed to spawn for task %s: %s", task_id, e)
+        await _release_claim(db_id, task_id, f"spawn failed: {e}")
+        return False
+    _release_counts.pop(db_id, None)
 
-        # Register broker BEFORE spawning (vault-clone needs the token immediately)
+    # Confirm the claim: assign to the Job and clear the lease
+    if await _confirm_claim(db_id, task_id, job_name):
         try:
-            task_repos = [VAULT_REPO]
-            if task.get("repos"):
-                repos = task["repos"] if isinstance(task["repos"], list) else []
-                task_repos.extend(repos)
-            await api_register_broker(db_id, task_repos, lobster_type)
-            logger.info("Broker registered via API for %s (db_id=%d)", task_id, db_id)
+            await api_log_event(db_id, "spawned", f"Job {job_name} ({lobster_type})", "task_poller")
         except (LobwifeAPIError, RuntimeError) as e:
-            logger.error("Failed to register broker for %s: %s (skipping spawn)", task_id, e)
-            continue
+            logger.warning("Failed to log spawn event for %s: %s", task_id, e)
 
+    # Post to Discord thread if configured
+    thread_id = task.get("discord_thread_id")
+    if thread_id and bot:
         try:
-            job_name = await _spawn_lobster_core(task_id, lobster_type, workflow)
-        except (ValueError, RuntimeError) as e:
-            logger.error("Failed to spawn for task %s: %s", task_id, e)
-            continue
+            channel = bot.get_channel(int(thread_id))
+            if channel:
+                await channel.send(
+                    f"**[poller]** Spawned **{lobster_type}** lobster `{job_name}` for **{task_id}**"
+                )
+        except Exception as e:
+            logger.warning("Failed to post Discord notification for %s: %s", task_id, e)
 
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    latency = _queued_seconds(task)
+    if latency is not None:
+        pickup_latency.observe(latency)
+    logger.info("Spawned and claimed: %s -> %s", task_id, job_name)
+    return True
 
-        # PATCH API: claim the task (source of truth)
-        try:
-            await api_update_task(
-                db_id,
-                status="active",
-                assigned_to=job_name,
-                assigned_at=now,
-                actor="task_poller",
-            )
-            await api_log_event(db_id, "spawned", f"Job {job_name} ({lobster_type})", "task_poller")
-        except (LobwifeAPIError, RuntimeError) as e:
-            logger.error("Failed to PATCH API for %s: %s", task_id, e)
 
-        # Post to Discord thread if configured
-        thread_id = task.get("discord_thread_id")
-        if thread_id and bot:
+async def poll_and_spawn(
+    vault_path: str, max_concurrent: int, bot=None, per_type: int = 0, per_repo: int = 0,
+    spawn_concurrency: int = SPAWN_CONCURRENCY,
+) -> int:
+    """Single poll cycle. Returns number of tasks spawned.
+
+    per_type / per_repo are fairness quotas on concurrently active tasks,
+    enforced server-side by the claim (0 = no cap). Claimed tasks are
+    spawned concurrently, at most spawn_concurrency at a time.
+    """
+    active_count = await _count_active_lobster_jobs()
+    available = max_concurrent - active_count
+    if available <= 0:
+        logger.debug("At capacity (%d/%d active lobsters), skipping", active_count, max_concurrent)
+        return 0
+
+    # Claim queued tasks atomically (priority, then oldest first; system
+    # tasks excluded server-side) so replicas never spawn the same task
+    try:
+        claimed = await api_claim_tasks(
+            CLAIMANT, limit=available, lease_seconds=CLAIM_LEASE_SECONDS,
+            per_type=per_type, per_repo=per_repo,
+        )
+    except (LobwifeAPIError, RuntimeError) as e:
+        logger.error("Failed to claim queued tasks from lobwife API: %s", e)
+        return 0
+
+    if not claimed:
+        return 0
+
+    logger.info("Claimed %d queued task(s), %d slot(s) available", len(claimed), available)
+
+    # Fan out across claimed tasks; each task's failures stay with that task
+    sem = asyncio.Semaphore(max(1, spawn_concurrency))
+
+    async def spawn_one(task: dict) -> bool:
+        async with sem:
+            start = time.monotonic()
             try:
-                channel = bot.get_channel(int(thread_id))
-                if channel:
-                    await channel.send(
-                        f"**[poller]** Spawned **{lobster_type}** lobster `{job_name}` for **{task_id}**"
-                    )
+                return await _spawn_claimed(task, bot)
             except Exception as e:
-                logger.warning("Failed to post Discord notification for %s: %s", task_id, e)
+                logger.exception("Unexpected error spawning %s", task["task_id"])
+                await _release_claim(task["id"], task["task_id"], f"spawn error: {e}")
+                return False
+            finally:
+                spawn_duration.observe(time.monotonic() - start)
 
-        logger.info("Spawned and claimed: %s -> %s", task_id, job_name)
-        spawned += 1
+    start = time.monotonic()
+    results = await asyncio.gather(*(spawn_one(t) for t in claimed))
+    elapsed = time.monotonic() - start
+    spawned = sum(results)
 
+    _spawn_totals["spawned"] += spawned
+    _spawn_totals["failed"] += len(claimed) - spawned
+    _last_batch.update(
+        claimed=len(claimed),
+        spawned=spawned,
+        seconds=round(elapsed, 2),
+        tasks_per_second=round(spawned / elapsed, 2) if elapsed > 0 else None,
+    )
     return spawned
 
 
-async def run_poller(vault_path: str, interval: int, max_concurrent: int, bot=None) -> None:
-    """Background loop that polls for queued tasks."""
-    logger.info("Task poller started (interval=%ds, max_concurrent=%d)", interval, max_concurrent)
+async def watch_changes(wake: asyncio.Event) -> None:
+    """Long-poll the lobwife change feed and set wake on relevant events."""
+    cursor = None
     while True:
         try:
-            spawned = await poll_and_spawn(vault_path, max_concurrent, bot)
-            if spawned:
-                logger.info("Poll cycle complete: spawned %d task(s)", spawned)
-        except Exception:
-            logger.exception("Task poller cycle failed")
-        await asyncio.sleep(interval)
+            result = await api_wait_for_changes(cursor, timeout=WATCH_TIMEOUT)
+        except (LobwifeAPIError, RuntimeError) as e:
+            logger.warning("Change feed unavailable, relying on poll interval: %s", e)
+            await asyncio.sleep(WATCH_RETRY_DELAY)
+            continue
+        cursor = result["cursor"]
+        changes = result["changes"]
+        if any(
+            c.get("task_status") in WAKE_STATUSES and c.get("actor") not in POLLER_ACTORS
+            for c in changes
+        ):
+            logger.debug("Change feed: %d event(s), waking poller", len(changes))
+            wake.set()
+
+
+async def run_poller(
+    vault_path: str, interval: int, max_concurrent: int, bot=None,
+    event_driven: bool = True, per_type: int = 0, per_repo: int = 0,
+    spawn_concurrency: int = SPAWN_CONCURRENCY,
+) -> None:
+    """Background loop that polls for queued tasks.
+
+    With event_driven, a cycle runs as soon as the change feed reports a
+    queued or finished task, and at least every interval seconds.
+    """
+    logger.info(
+        "Task poller started (interval=%ds, max_concurrent=%d, event_driven=%s)",
+        interval, max_concurrent, event_driven,
+    )
+    wake = asyncio.Event()
+    watcher = asyncio.create_task(watch_changes(wake)) if event_driven else None
+    trigger = "interval"
+    try:
+        while True:
+            _cycle_triggers[trigger] += 1
+            start = time.monotonic()
+            try:
+                spawned = await poll_and_spawn(
+                    vault_path, max_concurrent, bot, per_type, per_repo, spawn_concurrency,
+                )
+                if spawned:
+                    logger.info(
+                        "Poll cycle (%s) complete: spawned %d task(s) in %.1fs",
+                        trigger, spawned, time.monotonic() - start,
+                    )
+            except Exception:
+                logger.exception("Task poller cycle failed")
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=interval)
+                trigger = "event"
+            except asyncio.TimeoutError:
+                trigger = "interval"
+            wake.clear()
+    finally:
+        if watcher:
+            watcher.cancel()
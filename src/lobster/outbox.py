@@ -0,0 +1,189 @@
+"""Write-behind outbox for lobster telemetry sent to lobwife.
+
+Status updates and task events are queued in memory and sent in batches by
+a background task, so task start and completion never wait on the lobwife
+API and a brief lobwife outage doesn't lose telemetry. Pending items are
+mirrored to a small JSON file under the workspace (recovered if the process
+restarts in the same pod). Lobster pods are never restarted, so close()
+keeps retrying the final flush with backoff until a deadline that outlasts
+the client's circuit-breaker cooldown.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+from common.lobwife_client import LobwifeAPIError, log_events, update_tasks
+
+logger = logging.getLogger("lobster.outbox")
+
+OUTBOX_PATH = os.path.join(os.environ.get("WORKSPACE", "/workspace"), ".lobwife-outbox.json")
+FLUSH_INTERVAL = 0.5  # seconds to coalesce items before sending
+RETRY_DELAY = 5
+BATCH_MAX = 100
+CLOSE_DEADLINE = 60  # longer than the lobwife_client breaker cooldown (30s)
+CLOSE_RETRY_MAX = 8  # cap on the backoff between exit flush attempts
+
+
+class Outbox:
+    """Ordered queue of {kind: "update" | "event", ...} items for lobwife."""
+
+    def __init__(self, path: str = OUTBOX_PATH, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self._items: list[dict] = self._load()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.dropped = 0
+
+    # ── Producers (non-blocking) ─────────────────────────────────────
+
+    def log_event(self, db_id: int, event_type: str, detail: str | None = None,
+                  actor: str | None = None) -> None:
+        """Queue a task event, stamped with the current time."""
+        self._put({
+            "kind": "event",
+            "task_id": db_id,
+            "event_type": event_type,
+            "detail": detail,
+            "actor": actor,
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+
+    def update_task(self, db_id: int, **fields: Any) -> None:
+        """Queue a PATCH of task fields."""
+        self._put({"kind": "update", "id": db_id, **fields})
+
+    @property
+    def pending(self) -> int:
+        return len(self._items)
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            if self._items:
+                self._wake.set()
+
+    async def close(self, deadline: float = CLOSE_DEADLINE) -> None:
+        """Stop the background sender and flush what's left within deadline.
+
+        The sender is stopped only between sends, so an in-flight batch is
+        never interrupted (and later sent twice). Failed flushes are retried
+        with backoff until the deadline.
+        """
+        if self._task is not None:
+            # Holding the lock means no batch is mid-send
+            async with self._lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline
+        delay = 1.0
+        while self._items:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                if await asyncio.wait_for(self.flush(), timeout=remaining):
+                    break
+            except asyncio.TimeoutError:
+                break
+            await asyncio.sleep(min(delay, max(0.0, end - loop.time())))
+            delay = min(delay * 2, CLOSE_RETRY_MAX)
+        if self._items:
+            logger.warning("%d lobwife item(s) unsent at exit, kept in %s", len(self._items), self.path)
+        logger.info("Outbox closed: %d sent, %d dropped", self.sent, self.dropped)
+
+    async def flush(self) -> bool:
+        """Send everything pending, oldest first. False if lobwife is unreachable."""
+        async with self._lock:
+            while self._items:
+                batch = self._items[:BATCH_MAX]
+                try:
+                    await self._send(batch)
+                except LobwifeAPIError as e:
+                    if e.status >= 500:
+                        logger.warning("lobwife outbox flush failed: %s", e)
+                        return False
+                    # The whole batch was rejected; retrying won't help
+                    logger.error("lobwife rejected %d outbox item(s): %s", len(batch), e)
+                    self.dropped += len(batch)
+                except RuntimeError as e:
+                    logger.warning("lobwife outbox flush failed (%d pending): %s", len(self._items), e)
+                    return False
+                del self._items[:len(batch)]
+                self._persist()
+            return True
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _put(self, item: dict) -> None:
+        self._items.append(item)
+        self._persist()
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(self.flush_interval)
+            self._wake.clear()
+            if not await self.flush():
+                await asyncio.sleep(RETRY_DELAY)
+                self._wake.set()
+
+    async def _send(self, batch: list[dict]) -> None:
+        # Updates first so a final status lands before its event, as inline calls did
+        updates = [{k: v for k, v in i.items() if k != "kind"} for i in batch if i["kind"] == "update"]
+        events = [{k: v for k, v in i.items() if k != "kind"} for i in batch if i["kind"] == "event"]
+        if updates:
+            self._count(await update_tasks(updates))
+        if events:
+            self._count(await log_events(events))
+
+    def _count(self, result: dict) -> None:
+        for r in result.get("results", []):
+            if r["status"] < 300:
+                self.sent += 1
+            else:
+                self.dropped += 1
+                logger.warning("lobwife rejected outbox item: %s", r.get("error"))
+
+    def _load(self) -> list[dict]:
+        try:
+            with open(self.path) as f:
+                items = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable outbox file %s: %s", self.path, e)
+            return []
+        if not isinstance(items, list):
+            return []
+        if items:
+            logger.info("Recovered %d unsent lobwife item(s) from %s", len(items), self.path)
+        return items
+
+    def _persist(self) -> None:
+        try:
+            if not self._items:
+                if os.path.exists(self.path):
+                    os.unlink(self.path)
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._items, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Failed to persist outbox to %s: %s", self.path, e)
@@ -10,6 +10,7 @@ from common.logging import setup_logging, log_structured
 from common.vault import pull_vault, read_task
 from lobster.agent import run_task
 from lobster.config import LobsterConfig
+from lobster.outbox import Outbox
 
 logger = logging.getLogger("lobster.run_task")
 
@@ -30,22 +31,18 @@ def _parse_db_id(task_id: str) -> int | None:
     return None
 
 
-async def _api_log_event(db_id: int, event_type: str, detail: str = None, actor: str = None):
-    """Best-effort API event log."""
-    try:
-        from common.lobwife_client import log_event
-        await log_event(db_id, event_type, detail, actor)
-    except Exception as e:
-        logger.warning("Failed to log event via API: %s", e)
+# Write-behind queue for lobwife telemetry, created in _run_and_close
+_outbox: Outbox | None = None
 
 
-async def _api_update_status(db_id: int, status: str, **extra):
-    """Best-effort API status update."""
-    try:
-        from common.lobwife_client import update_task
-        await update_task(db_id, status=status, actor="lobster", **extra)
-    except Exception as e:
-        logger.warning("Failed to update task status via API: %s", e)
+def _api_log_event(db_id: int, event_type: str, detail: str = None, actor: str = None):
+    """Queue a task event for lobwife (sent in the background)."""
+    _outbox.log_event(db_id, event_type, detail, actor)
+
+
+def _api_update_status(db_id: int, status: str, **extra):
+    """Queue a task status update for lobwife (sent in the background)."""
+    _outbox.update_task(db_id, status=status, actor="lobster", **extra)
 
 
 async def main_async() -> int:
@@ -72,7 +69,7 @@ async def main_async() -> int:
 
     # Log started event via API
     if db_id:
-        await _api_log_event(db_id, "started", f"type={config.lobster_type} model={config.model}", "lobster")
+        _api_log_event(db_id, "started", f"type={config.lobster_type} model={config.model}", "lobster")
 
     # Pull latest vault (non-fatal — vault may be bind-mounted in local dev)
     try:
@@ -101,8 +98,8 @@ async def main_async() -> int:
         if not task_data:
             logger.error("Task %s not found in vault at %s", config.task_id, config.vault_path)
             if db_id:
-                await _api_update_status(db_id, "failed", completed_at=_now_iso())
-                await _api_log_event(db_id, "failed", "Task file not found in vault", "lobster")
+                _api_update_status(db_id, "failed", completed_at=_now_iso())
+                _api_log_event(db_id, "failed", "Task file not found in vault", "lobster")
             return 1
 
     metadata = task_data["metadata"]
@@ -163,11 +160,11 @@ async def main_async() -> int:
     now = _now_iso()
     if db_id:
         if result["is_error"]:
-            await _api_update_status(db_id, "failed", completed_at=now)
-            await _api_log_event(db_id, "failed", f"turns={total_turns} cost=${total_cost:.2f}", "lobster")
+            _api_update_status(db_id, "failed", completed_at=now)
+            _api_log_event(db_id, "failed", f"turns={total_turns} cost=${total_cost:.2f}", "lobster")
         else:
-            await _api_update_status(db_id, "completed", completed_at=now)
-            await _api_log_event(db_id, "completed", f"turns={total_turns} cost=${total_cost:.2f}", "lobster")
+            _api_update_status(db_id, "completed", completed_at=now)
+            _api_log_event(db_id, "completed", f"turns={total_turns} cost=${total_cost:.2f}", "lobster")
 
     return 1 if result["is_error"] else 0
 
@@ -278,9 +275,24 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+async def _run_and_close() -> int:
+    """Run the task, then drain the outbox and close the shared lobwife
+    session on the same loop."""
+    global _outbox
+    from common.lobwife_client import close_session
+
+    _outbox = Outbox()
+    _outbox.start()
+    try:
+        return await main_async()
+    finally:
+        await _outbox.close()
+        await close_session()
+
+
 def main() -> None:
     setup_logging(json_output=True)
-    exit_code = asyncio.run(main_async())
+    exit_code = asyncio.run(_run_and_close())
     sys.exit(exit_code)
 
 